@@ -5,8 +5,36 @@ from datetime import datetime
 from typing import List
 
 from duckduckgo_search import DDGS
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import yfinance as yf
 
+YF_POOL_SIZE = 32
+# (connect, read) seconds for every Yahoo request; yfinance itself asks for 30s
+YF_TIMEOUT = (2, 5)
+
+
+class _TimeoutSession(requests.Session):
+    def request(self, method, url, **kwargs):
+        kwargs["timeout"] = YF_TIMEOUT
+        return super().request(method, url, **kwargs)
+
+
+def _build_yf_session() -> requests.Session:
+    session = _TimeoutSession()
+    adapter = HTTPAdapter(
+        pool_connections=YF_POOL_SIZE,
+        pool_maxsize=YF_POOL_SIZE,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every yfinance call so HTTPS connections (and TLS handshakes) are reused
+YF_SESSION = _build_yf_session()
+
 
 @dataclass
 class StockQuote:
@@ -29,7 +57,7 @@ def get_stock_price_info(symbol: str) -> StockQuote:
     Fetch the current price and previous close for a ticker using yfinance.
     Falls back to historical data when fast_info fields are missing or zero.
     """
-    ticker = yf.Ticker(symbol)
+    ticker = yf.Ticker(symbol, session=YF_SESSION)
     info = ticker.fast_info
     current_price = float(
         info.get("last_price")
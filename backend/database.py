@@ -1,65 +1,34 @@
 def upsert_current_insight(user_id: str, ticker: str, summary: str, move: str | None, sentiment: str | None, analysis_json: str | None):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO insights_current (user_id, ticker, summary, move, sentiment, analysis_json, captured_at)
-        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(user_id, ticker) DO UPDATE SET
-            summary = excluded.summary,
-            move = excluded.move,
-            sentiment = excluded.sentiment,
-            analysis_json = excluded.analysis_json,
-            captured_at = excluded.captured_at
-    ''', (user_id, ticker, summary, move, sentiment, analysis_json))
-    conn.commit()
-    conn.close()
-
-
-def upsert_current_insight(user_id: str, ticker: str, summary: str, move: str | None, sentiment: str | None, analysis_json: str | None):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO insights_current (user_id, ticker, summary, move, sentiment, analysis_json, captured_at)
-        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(user_id, ticker) DO UPDATE SET
-            summary = excluded.summary,
-            move = excluded.move,
-            sentiment = excluded.sentiment,
-            analysis_json = excluded.analysis_json,
-            captured_at = excluded.captured_at
-    ''', (user_id, ticker, summary, move, sentiment, analysis_json))
-    conn.commit()
-    conn.close()
-
-
-def get_current_insights(user_id: str):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT ticker, summary, move, sentiment, analysis_json, captured_at
-        FROM insights_current
-        WHERE user_id = ?
-        ORDER BY captured_at DESC
-    ''', (user_id,))
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+    with write_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO insights_current (user_id, ticker, summary, move, sentiment, analysis_json, captured_at)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(user_id, ticker) DO UPDATE SET
+                summary = excluded.summary,
+                move = excluded.move,
+                sentiment = excluded.sentiment,
+                analysis_json = excluded.analysis_json,
+                captured_at = excluded.captured_at
+        ''', (user_id, ticker, summary, move, sentiment, analysis_json))
 
 
 def get_current_insights(user_id: str):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT ticker, summary, move, sentiment, analysis_json, captured_at
-        FROM insights_current
-        WHERE user_id = ?
-        ORDER BY captured_at DESC
-    ''', (user_id,))
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT ticker, summary, move, sentiment, analysis_json, captured_at
+            FROM insights_current
+            WHERE user_id = ?
+            ORDER BY captured_at DESC
+        ''', (user_id,))
+        rows = rows_to_dicts(cursor, cursor.fetchall())
+    return rows
 import sqlite3
 import os
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 
 DEFAULT_DB_PATH = "/Users/adityabhushansingh/Documents/Personal/learn/portfolio.db"
@@ -77,175 +46,305 @@ def normalize_category_name(category: str | None) -> str:
     cleaned = category.strip()
     return CATEGORY_NORMALIZATION.get(cleaned.lower(), cleaned)
 
+READ_POOL_SIZE = 8
+
+
 def get_db():
-    """Get database connection"""
+    """Open a standalone database connection (scripts and one-off maintenance)"""
     db_dir = os.path.dirname(DATABASE)
     if db_dir and not os.path.exists(db_dir):
         os.makedirs(db_dir, exist_ok=True)
-    conn = sqlite3.connect(DATABASE)
+    conn = sqlite3.connect(DATABASE, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    # Per-connection settings: 64 MiB page cache and 256 MiB memory-mapped reads
+    conn.execute('PRAGMA cache_size=-65536')
+    conn.execute('PRAGMA mmap_size=268435456')
     return conn
 
+
+class ReadPool:
+    """Bounded pool of reader connections shared across request threads.
+
+    Connections are opened lazily up to `size`; callers beyond that wait for
+    one to be returned.
+    """
+
+    def __init__(self, size: int = READ_POOL_SIZE):
+        self._size = size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._opened < self._size
+            if can_open:
+                self._opened += 1
+        if not can_open:
+            return self._idle.get()
+        try:
+            return get_db()
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._opened -= 1
+
+
+_read_pool = ReadPool()
+_writer: sqlite3.Connection | None = None
+_writer_lock = threading.RLock()
+
+
+@contextmanager
+def read_conn():
+    """Check out a pooled reader connection"""
+    conn = _read_pool.acquire()
+    try:
+        yield conn
+    finally:
+        _read_pool.release(conn)
+
+
+@contextmanager
+def write_conn():
+    """Use the single writer connection; commits on success, rolls back on error"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = get_db()
+            # WAL lets the pooled readers keep reading while the writer commits;
+            # it is persisted in the database file, so init_db() sets it once
+            _writer.execute('PRAGMA journal_mode=WAL')
+        with _writer:
+            yield _writer
+
+
+def close_connections():
+    """Close the writer and any idle pooled readers"""
+    global _writer
+    _read_pool.close()
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+
+def rows_to_dicts(cursor, rows) -> list[dict]:
+    """Convert fetched rows to dicts using one column-name lookup for the whole result."""
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in rows]
+
 def init_db():
     """Initialize database with holdings table"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_info (
-            user_id TEXT PRIMARY KEY,
-            display_name TEXT NOT NULL,
-            email TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS insights_current (
-            user_id TEXT NOT NULL,
-            ticker TEXT NOT NULL,
-            summary TEXT NOT NULL,
-            move TEXT,
-            sentiment TEXT,
-            analysis_json TEXT,
-            captured_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (user_id, ticker),
-            FOREIGN KEY (user_id) REFERENCES user_info(user_id)
-        )
-    ''')
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_insights_user
-        ON insights_current(user_id, captured_at)
-    ''')
-    cursor.execute('PRAGMA table_info(insights_current)')
-    insight_columns = [column[1] for column in cursor.fetchall()]
-    if 'analysis_json' not in insight_columns:
-        cursor.execute('ALTER TABLE insights_current ADD COLUMN analysis_json TEXT')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS holdings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            holding_id TEXT NOT NULL,  -- UUID to group versions of the same holding
-            account_type TEXT NOT NULL,
-            account TEXT NOT NULL,
-            ticker TEXT,
-            name TEXT NOT NULL,
-            category TEXT NOT NULL,
-            lookup TEXT,
-            shares REAL NOT NULL,
-            cost REAL NOT NULL,
-            current_price REAL NOT NULL,
-            contribution REAL NOT NULL,
-            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            is_deleted BOOLEAN DEFAULT FALSE,  -- Soft delete support
-            track_price BOOLEAN DEFAULT TRUE,
-            track_insights BOOLEAN DEFAULT TRUE,
-            manual_price_override BOOLEAN DEFAULT FALSE,
-            value_override REAL,
-            convert_to_cad BOOLEAN DEFAULT FALSE,
-            cad_conversion_rate REAL,
-            user_id TEXT NOT NULL DEFAULT 'default',
-            FOREIGN KEY (user_id) REFERENCES user_info(user_id)
-        )
-    ''')
-    
-    # Create price history table for sparklines
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS price_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            ticker TEXT NOT NULL,
-            price REAL NOT NULL,
-            date DATE NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(ticker, date)
-        )
-    ''')
+    with write_conn() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS price_history_hourly (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            ticker TEXT NOT NULL,
-            price REAL NOT NULL,
-            timestamp DATETIME NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(ticker, timestamp)
-        )
-    ''')
-    
-    # Add holding_id column to existing table if it doesn't exist
-    cursor.execute('PRAGMA table_info(holdings)')
-    columns = [column[1] for column in cursor.fetchall()]
-    
-    if 'holding_id' not in columns:
-        cursor.execute('ALTER TABLE holdings ADD COLUMN holding_id TEXT')
-        # Generate holding_id for existing records
-        cursor.execute('UPDATE holdings SET holding_id = hex(randomblob(16)) WHERE holding_id IS NULL')
-    
-    if 'is_deleted' not in columns:
-        cursor.execute('ALTER TABLE holdings ADD COLUMN is_deleted BOOLEAN DEFAULT FALSE')
-    if 'track_price' not in columns:
-        cursor.execute('ALTER TABLE holdings ADD COLUMN track_price BOOLEAN DEFAULT TRUE')
-        cursor.execute('UPDATE holdings SET track_price = TRUE WHERE track_price IS NULL')
-    if 'track_insights' not in columns:
-        cursor.execute('ALTER TABLE holdings ADD COLUMN track_insights BOOLEAN DEFAULT TRUE')
-        cursor.execute('UPDATE holdings SET track_insights = TRUE WHERE track_insights IS NULL')
-    else:
-        # Update existing FALSE values to TRUE for better default behavior
-        cursor.execute('UPDATE holdings SET track_insights = TRUE WHERE track_insights = FALSE')
-    if 'manual_price_override' not in columns:
-        cursor.execute('ALTER TABLE holdings ADD COLUMN manual_price_override BOOLEAN DEFAULT FALSE')
-        cursor.execute('UPDATE holdings SET manual_price_override = FALSE WHERE manual_price_override IS NULL')
-    if 'value_override' not in columns:
-        cursor.execute('ALTER TABLE holdings ADD COLUMN value_override REAL')
-    if 'convert_to_cad' not in columns:
-        cursor.execute('ALTER TABLE holdings ADD COLUMN convert_to_cad BOOLEAN DEFAULT FALSE')
-    if 'cad_conversion_rate' not in columns:
-        cursor.execute('ALTER TABLE holdings ADD COLUMN cad_conversion_rate REAL')
-
-    # Normalize legacy categories (e.g., ETFs -> ETF)
-    cursor.execute("UPDATE holdings SET category = 'ETF' WHERE LOWER(TRIM(category)) IN ('etf', 'etfs')")
-
-    # Ensure price_history has updated_at column (for existing databases)
-    cursor.execute('PRAGMA table_info(price_history)')
-    price_columns = [column[1] for column in cursor.fetchall()]
-    if 'updated_at' not in price_columns:
-        cursor.execute('ALTER TABLE price_history ADD COLUMN updated_at TIMESTAMP')
-        cursor.execute('UPDATE price_history SET updated_at = COALESCE(updated_at, created_at, CURRENT_TIMESTAMP)')
-
-    # Insert primary user if not exists
-    cursor.execute('INSERT OR IGNORE INTO user_info (user_id, display_name, email) VALUES (?, ?, ?)', ('default', 'Primary User', 'primary@example.com'))
-
-    # Migrate existing rows to 'default' if user_id column was just added
-    cursor.execute('PRAGMA table_info(holdings)')
-    holdings_columns = [column[1] for column in cursor.fetchall()]
-    if 'user_id' not in holdings_columns:
-        cursor.execute('ALTER TABLE holdings ADD COLUMN user_id TEXT NOT NULL DEFAULT "default"')
-        cursor.execute('UPDATE holdings SET user_id = "default" WHERE user_id IS NULL')
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_holdings_user_id
-            ON holdings(user_id)
+            CREATE TABLE IF NOT EXISTS user_info (
+                user_id TEXT PRIMARY KEY,
+                display_name TEXT NOT NULL,
+                email TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
         ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS insights_current (
+                user_id TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                move TEXT,
+                sentiment TEXT,
+                analysis_json TEXT,
+                captured_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (user_id, ticker),
+                FOREIGN KEY (user_id) REFERENCES user_info(user_id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_insights_user
+            ON insights_current(user_id, captured_at)
+        ''')
+        cursor.execute('PRAGMA table_info(insights_current)')
+        insight_columns = [column[1] for column in cursor.fetchall()]
+        if 'analysis_json' not in insight_columns:
+            cursor.execute('ALTER TABLE insights_current ADD COLUMN analysis_json TEXT')
 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS portfolio_snapshots (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id TEXT NOT NULL DEFAULT 'default',
-            captured_at TIMESTAMP NOT NULL,
-            total_value REAL NOT NULL,
-            total_contribution REAL NOT NULL,
-            total_gain REAL NOT NULL,
-            total_gain_percent REAL NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES user_info(user_id)
-        )
-    ''')
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_portfolio_snapshots_user_time
-        ON portfolio_snapshots(user_id, captured_at)
-    ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS holdings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                holding_id TEXT NOT NULL,  -- UUID to group versions of the same holding
+                account_type TEXT NOT NULL,
+                account TEXT NOT NULL,
+                ticker TEXT,
+                name TEXT NOT NULL,
+                category TEXT NOT NULL,
+                lookup TEXT,
+                shares REAL NOT NULL,
+                cost REAL NOT NULL,
+                current_price REAL NOT NULL,
+                contribution REAL NOT NULL,
+                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                is_deleted BOOLEAN DEFAULT FALSE,  -- Soft delete support
+                track_price BOOLEAN DEFAULT TRUE,
+                track_insights BOOLEAN DEFAULT TRUE,
+                manual_price_override BOOLEAN DEFAULT FALSE,
+                value_override REAL,
+                convert_to_cad BOOLEAN DEFAULT FALSE,
+                cad_conversion_rate REAL,
+                user_id TEXT NOT NULL DEFAULT 'default',
+                FOREIGN KEY (user_id) REFERENCES user_info(user_id)
+            )
+        ''')
+
+        # Create price history table for sparklines
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS price_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticker TEXT NOT NULL,
+                price REAL NOT NULL,
+                date DATE NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(ticker, date)
+            )
+        ''')
+
+        # Display names rarely change, so they are looked up once per ticker
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ticker_names (
+                ticker TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS price_history_hourly (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticker TEXT NOT NULL,
+                price REAL NOT NULL,
+                timestamp DATETIME NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(ticker, timestamp)
+            )
+        ''')
 
-    conn.commit()
-    conn.close()
+        # Latest-price lookups (MAX(updated_at) per ticker) and the date-window
+        # history scans; (ticker, date) and (ticker, timestamp) are already
+        # covered by the UNIQUE constraints.
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_price_history_ticker_updated
+            ON price_history(ticker, updated_at)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_price_history_updated
+            ON price_history(updated_at)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_price_history_hourly_timestamp
+            ON price_history_hourly(timestamp)
+        ''')
+
+        # Add holding_id column to existing table if it doesn't exist
+        cursor.execute('PRAGMA table_info(holdings)')
+        columns = [column[1] for column in cursor.fetchall()]
+
+        if 'holding_id' not in columns:
+            cursor.execute('ALTER TABLE holdings ADD COLUMN holding_id TEXT')
+            # Generate holding_id for existing records
+            cursor.execute('UPDATE holdings SET holding_id = hex(randomblob(16)) WHERE holding_id IS NULL')
+
+        if 'is_deleted' not in columns:
+            cursor.execute('ALTER TABLE holdings ADD COLUMN is_deleted BOOLEAN DEFAULT FALSE')
+        if 'track_price' not in columns:
+            cursor.execute('ALTER TABLE holdings ADD COLUMN track_price BOOLEAN DEFAULT TRUE')
+            cursor.execute('UPDATE holdings SET track_price = TRUE WHERE track_price IS NULL')
+        if 'track_insights' not in columns:
+            cursor.execute('ALTER TABLE holdings ADD COLUMN track_insights BOOLEAN DEFAULT TRUE')
+            cursor.execute('UPDATE holdings SET track_insights = TRUE WHERE track_insights IS NULL')
+        else:
+            # Update existing FALSE values to TRUE for better default behavior
+            cursor.execute('UPDATE holdings SET track_insights = TRUE WHERE track_insights = FALSE')
+        if 'manual_price_override' not in columns:
+            cursor.execute('ALTER TABLE holdings ADD COLUMN manual_price_override BOOLEAN DEFAULT FALSE')
+            cursor.execute('UPDATE holdings SET manual_price_override = FALSE WHERE manual_price_override IS NULL')
+        if 'value_override' not in columns:
+            cursor.execute('ALTER TABLE holdings ADD COLUMN value_override REAL')
+        if 'convert_to_cad' not in columns:
+            cursor.execute('ALTER TABLE holdings ADD COLUMN convert_to_cad BOOLEAN DEFAULT FALSE')
+        if 'cad_conversion_rate' not in columns:
+            cursor.execute('ALTER TABLE holdings ADD COLUMN cad_conversion_rate REAL')
+
+        # Normalize legacy categories (e.g., ETFs -> ETF)
+        cursor.execute("UPDATE holdings SET category = 'ETF' WHERE LOWER(TRIM(category)) IN ('etf', 'etfs')")
+
+        # Ensure price_history has updated_at column (for existing databases)
+        cursor.execute('PRAGMA table_info(price_history)')
+        price_columns = [column[1] for column in cursor.fetchall()]
+        if 'updated_at' not in price_columns:
+            cursor.execute('ALTER TABLE price_history ADD COLUMN updated_at TIMESTAMP')
+            cursor.execute('UPDATE price_history SET updated_at = COALESCE(updated_at, created_at, CURRENT_TIMESTAMP)')
+
+        # Insert primary user if not exists
+        cursor.execute('INSERT OR IGNORE INTO user_info (user_id, display_name, email) VALUES (?, ?, ?)', ('default', 'Primary User', 'primary@example.com'))
+
+        # Migrate existing rows to 'default' if user_id column was just added
+        cursor.execute('PRAGMA table_info(holdings)')
+        holdings_columns = [column[1] for column in cursor.fetchall()]
+        if 'user_id' not in holdings_columns:
+            cursor.execute('ALTER TABLE holdings ADD COLUMN user_id TEXT NOT NULL DEFAULT "default"')
+            cursor.execute('UPDATE holdings SET user_id = "default" WHERE user_id IS NULL')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_holdings_user_id
+                ON holdings(user_id)
+            ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_holdings_insights
+            ON holdings(user_id) WHERE track_insights = 1
+        ''')
+        # Serves the per-account-type rollups over non-deleted holdings
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_holdings_active
+            ON holdings(is_deleted, account_type, ticker)
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL DEFAULT 'default',
+                captured_at TIMESTAMP NOT NULL,
+                total_value REAL NOT NULL,
+                total_contribution REAL NOT NULL,
+                total_gain REAL NOT NULL,
+                total_gain_percent REAL NOT NULL,
+                FOREIGN KEY (user_id) REFERENCES user_info(user_id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_portfolio_snapshots_user_time
+            ON portfolio_snapshots(user_id, captured_at)
+        ''')
 
 
 def ensure_price_history_seed(
@@ -260,25 +359,18 @@ def ensure_price_history_seed(
     ticker = (ticker or '').strip()
     if not ticker:
         return
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT 1 FROM price_history WHERE ticker = ? LIMIT 1', (ticker,))
-    exists = cursor.fetchone()
-    conn.close()
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT 1 FROM price_history WHERE ticker = ? LIMIT 1', (ticker,))
+        exists = cursor.fetchone()
     if exists:
         return
     if price is None:
         price = 0
     add_price_history(ticker, price)
 
-def get_all_holdings(user_id: str | None = None):
-    """Get all holdings from database (only latest versions, not deleted)"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Get only the latest version of each holding that is not deleted
-    query = '''
-        SELECT h.*, ph.price AS latest_price, ph.updated_at AS price_updated_at
+# Latest non-deleted version of each holding joined to its most recent price
+_LATEST_HOLDINGS_WITH_PRICE = '''
         FROM holdings h
         LEFT JOIN price_history ph
             ON ph.ticker = h.lookup
@@ -294,16 +386,40 @@ def get_all_holdings(user_id: str | None = None):
             GROUP BY holding_id
         ) latest ON h.id = latest.max_id
         WHERE h.is_deleted = FALSE
-    '''
-    params = []
-    if user_id is not None:
-        query += ' AND h.user_id = ?'
-        params.append(user_id)
-    query += ' ORDER BY h.account_type, h.account, h.name'
-    
-    cursor.execute(query, params)
-    holdings = cursor.fetchall()
-    conn.close()
+'''
+
+_IS_CASH_SQL = "(LOWER(TRIM(COALESCE(h.category, ''))) = 'cash' OR (TRIM(COALESCE(h.ticker, '')) = '' AND TRIM(COALESCE(h.lookup, '')) = ''))"
+
+# Mirrors the price selection in main.enrich_holdings_with_calculations
+_EFFECTIVE_PRICE_SQL = f'''
+            CASE
+                WHEN COALESCE(h.manual_price_override, FALSE) = FALSE
+                     AND NOT {_IS_CASH_SQL}
+                     AND ph.price IS NOT NULL
+                THEN ph.price
+                ELSE h.current_price
+            END
+'''
+
+
+def get_all_holdings(user_id: str | None = None):
+    """Get all holdings from database (only latest versions, not deleted)"""
+    with read_conn() as conn:
+        cursor = conn.cursor()
+
+        # Get only the latest version of each holding that is not deleted
+        query = (
+            f'SELECT h.*, ph.price AS latest_price, ph.updated_at AS price_updated_at, {_IS_CASH_SQL} AS is_cash'
+            + _LATEST_HOLDINGS_WITH_PRICE
+        )
+        params = []
+        if user_id is not None:
+            query += ' AND h.user_id = ?'
+            params.append(user_id)
+        query += ' ORDER BY h.account_type, h.account, h.name'
+
+        cursor.execute(query, params)
+        holdings = rows_to_dicts(cursor, cursor.fetchall())
     return holdings
 
 def get_all_holdings_for_user(user_id: str):
@@ -311,9 +427,48 @@ def get_all_holdings_for_user(user_id: str):
     return get_all_holdings(user_id=user_id)
 
 
+def get_portfolio_aggregates(user_id: str | None = None) -> dict:
+    """Sum market value and contribution of the latest holdings inside SQLite."""
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        query = f'''
+            SELECT COALESCE(SUM(h.shares * {_EFFECTIVE_PRICE_SQL}), 0) AS total_value,
+                   COALESCE(SUM(h.contribution), 0) AS total_contribution,
+                   COUNT(*) AS holdings_count
+        ''' + _LATEST_HOLDINGS_WITH_PRICE
+        params = []
+        if user_id is not None:
+            query += ' AND h.user_id = ?'
+            params.append(user_id)
+        cursor.execute(query, params)
+        totals = dict(cursor.fetchone())
+    return totals
+
+
+def get_holdings_cache_state(user_id: str | None = None) -> tuple:
+    """Return a cheap fingerprint of the rows that feed enriched holdings.
+
+    Holdings are versioned by inserting new rows and soft-deleted in place, so
+    MAX(id) plus the deleted count tracks every holdings change; the latest
+    price_history write covers price captures.
+    """
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        query = 'SELECT MAX(id), COUNT(*), SUM(is_deleted) FROM holdings'
+        params = []
+        if user_id is not None:
+            query += ' WHERE user_id = ?'
+            params.append(user_id)
+        cursor.execute(query, params)
+        holdings_state = tuple(cursor.fetchone())
+        cursor.execute('SELECT MAX(updated_at), COUNT(*) FROM price_history')
+        price_state = tuple(cursor.fetchone())
+    return holdings_state + price_state
+
+
 def _get_holdings_snapshot(cursor, user_id: str | None = None):
-    query = '''
-        SELECT h.*
+    query = f'''
+        SELECT h.*, {_IS_CASH_SQL} AS is_cash
         FROM holdings h
         INNER JOIN (
             SELECT holding_id, MAX(id) as max_id
@@ -328,34 +483,76 @@ def _get_holdings_snapshot(cursor, user_id: str | None = None):
         query += ' AND h.user_id = ?'
         params.append(user_id)
     cursor.execute(query, params)
-    rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return rows_to_dicts(cursor, cursor.fetchall())
 
 
 def get_active_holdings(user_id: str | None = None):
-    conn = get_db()
-    cursor = conn.cursor()
-    query = '''
-        SELECT h.* FROM holdings h
-        INNER JOIN (
-            SELECT holding_id, MAX(id) as max_id
-            FROM holdings
-            WHERE is_deleted = FALSE
-            GROUP BY holding_id
-        ) latest ON h.id = latest.max_id
-        WHERE h.is_deleted = FALSE
-          AND h.track_price = TRUE
-          AND h.lookup IS NOT NULL
-          AND TRIM(h.lookup) != ''
-    '''
-    params = []
-    if user_id is not None:
-        query += ' AND h.user_id = ?'
-        params.append(user_id)
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        query = '''
+            SELECT h.* FROM holdings h
+            INNER JOIN (
+                SELECT holding_id, MAX(id) as max_id
+                FROM holdings
+                WHERE is_deleted = FALSE
+                GROUP BY holding_id
+            ) latest ON h.id = latest.max_id
+            WHERE h.is_deleted = FALSE
+              AND h.track_price = TRUE
+              AND h.lookup IS NOT NULL
+              AND TRIM(h.lookup) != ''
+        '''
+        params = []
+        if user_id is not None:
+            query += ' AND h.user_id = ?'
+            params.append(user_id)
+        cursor.execute(query, params)
+        rows = rows_to_dicts(cursor, cursor.fetchall())
+    return rows
+
+
+def get_capture_symbols() -> list[str]:
+    """Distinct lookup symbols across the latest non-deleted holdings of every user."""
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT DISTINCT h.lookup FROM holdings h
+            INNER JOIN (
+                SELECT holding_id, MAX(id) as max_id
+                FROM holdings
+                WHERE is_deleted = FALSE
+                GROUP BY holding_id
+            ) latest ON h.id = latest.max_id
+            WHERE h.is_deleted = FALSE
+              AND h.lookup IS NOT NULL
+              AND TRIM(h.lookup) != ''
+            ORDER BY h.lookup
+        ''')
+        return [row[0] for row in cursor.fetchall()]
+
+
+def get_insight_symbols(user_id: str) -> list[str]:
+    """Symbols of a user's latest holdings that track insights, deduped in holdings order.
+
+    The symbol is the lookup, falling back to the ticker when lookup is empty.
+    """
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT TRIM(CASE WHEN h.lookup IS NOT NULL AND h.lookup != '' THEN h.lookup ELSE h.ticker END) AS symbol
+            FROM holdings h
+            INNER JOIN (
+                SELECT holding_id, MAX(id) as max_id
+                FROM holdings
+                WHERE is_deleted = FALSE
+                GROUP BY holding_id
+            ) latest ON h.id = latest.max_id
+            WHERE h.is_deleted = FALSE
+              AND h.user_id = ?
+              AND h.track_insights = 1
+            ORDER BY h.account_type, h.account, h.name
+        ''', (user_id,))
+        return list(dict.fromkeys(row[0] for row in cursor.fetchall() if row[0]))
 
 
 def _normalize_symbol(value: str | None) -> str:
@@ -363,6 +560,9 @@ def _normalize_symbol(value: str | None) -> str:
 
 
 def _is_cash_holding(holding: dict) -> bool:
+    is_cash = holding.get('is_cash')
+    if is_cash is not None:
+        return bool(is_cash)
     category = (holding.get('category') or '').strip().lower()
     ticker = (holding.get('ticker') or '').strip()
     lookup = (holding.get('lookup') or '').strip()
@@ -409,57 +609,54 @@ def _calculate_holding_value(holding: dict, historical_price: float | None) -> f
 
 def get_holding_by_id(id):
     """Get a single holding by ID"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM holdings WHERE id = ?', (id,))
-    holding = cursor.fetchone()
-    conn.close()
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM holdings WHERE id = ?', (id,))
+        holding = cursor.fetchone()
     return holding
 
 def create_holding(data):
     """Create a new holding"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    import uuid
-    holding_id = str(uuid.uuid4())
-    
-    # Allow manual contribution override; default to shares × cost
-    provided_contribution = data.get('contribution')
-    contribution = provided_contribution if provided_contribution is not None else data['shares'] * data['cost']
-    
-    track_price = data.get('track_price', True)
-    manual_price_override = data.get('manual_price_override', False)
-
-    category = normalize_category_name(data.get('category'))
+    with write_conn() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute('''
-        INSERT INTO holdings (holding_id, account_type, account, ticker, name, category, 
-                            lookup, shares, cost, current_price, contribution, track_price, track_insights, manual_price_override, value_override, convert_to_cad, cad_conversion_rate)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        holding_id,
-        data['account_type'],
-        data['account'],
-        data['ticker'],
-        data['name'],
-        category,
-        data['lookup'],
-        data['shares'],
-        data['cost'],
-        data['current_price'],
-        contribution,
-        track_price,
-        bool(data.get('track_insights', False)),
-        manual_price_override,
-        data.get('value_override'),
-        bool(data.get('convert_to_cad', False)),
-        data.get('cad_conversion_rate'),
-    ))
+        import uuid
+        holding_id = str(uuid.uuid4())
 
-    conn.commit()
-    holding_db_id = cursor.lastrowid
-    conn.close()
+        # Allow manual contribution override; default to shares × cost
+        provided_contribution = data.get('contribution')
+        contribution = provided_contribution if provided_contribution is not None else data['shares'] * data['cost']
+
+        track_price = data.get('track_price', True)
+        manual_price_override = data.get('manual_price_override', False)
+
+        category = normalize_category_name(data.get('category'))
+
+        cursor.execute('''
+            INSERT INTO holdings (holding_id, account_type, account, ticker, name, category, 
+                                lookup, shares, cost, current_price, contribution, track_price, track_insights, manual_price_override, value_override, convert_to_cad, cad_conversion_rate)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            holding_id,
+            data['account_type'],
+            data['account'],
+            data['ticker'],
+            data['name'],
+            category,
+            data['lookup'],
+            data['shares'],
+            data['cost'],
+            data['current_price'],
+            contribution,
+            track_price,
+            bool(data.get('track_insights', False)),
+            manual_price_override,
+            data.get('value_override'),
+            bool(data.get('convert_to_cad', False)),
+            data.get('cad_conversion_rate'),
+        ))
+
+        holding_db_id = cursor.lastrowid
 
     ensure_price_history_seed(
         data.get('lookup') or data.get('ticker'),
@@ -471,56 +668,53 @@ def create_holding(data):
 
 def update_holding(id, data):
     """Update an existing holding by creating a new version"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Get the holding_id of the existing record
-    cursor.execute('SELECT holding_id FROM holdings WHERE id = ?', (id,))
-    result = cursor.fetchone()
-    
-    if not result:
-        conn.close()
-        raise ValueError("Holding not found")
-    
-    holding_id = result['holding_id']
-    
-    # Allow manual override for contribution when supplied
-    provided_contribution = data.get('contribution')
-    contribution = provided_contribution if provided_contribution is not None else data['shares'] * data['cost']
-    
-    # Create a new version with the updated data
-    track_price = data.get('track_price', True)
-    manual_price_override = data.get('manual_price_override', False)
-
-    category = normalize_category_name(data.get('category'))
+    with write_conn() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute('''
-        INSERT INTO holdings (holding_id, account_type, account, ticker, name, category, 
-                            lookup, shares, cost, current_price, contribution, track_price, track_insights, manual_price_override, value_override, convert_to_cad, cad_conversion_rate)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        holding_id,
-        data['account_type'],
-        data['account'],
-        data['ticker'],
-        data['name'],
-        category,
-        data['lookup'],
-        data['shares'],
-        data['cost'],
-        data['current_price'],
-        contribution,
-        track_price,
-        bool(data.get('track_insights', False)),
-        manual_price_override,
-        data.get('value_override'),
-        bool(data.get('convert_to_cad', False)),
-        data.get('cad_conversion_rate'),
-    ))
+        # Get the holding_id of the existing record
+        cursor.execute('SELECT holding_id FROM holdings WHERE id = ?', (id,))
+        result = cursor.fetchone()
+
+        if not result:
+            raise ValueError("Holding not found")
+
+        holding_id = result['holding_id']
+
+        # Allow manual override for contribution when supplied
+        provided_contribution = data.get('contribution')
+        contribution = provided_contribution if provided_contribution is not None else data['shares'] * data['cost']
+
+        # Create a new version with the updated data
+        track_price = data.get('track_price', True)
+        manual_price_override = data.get('manual_price_override', False)
 
-    conn.commit()
-    new_holding_id = cursor.lastrowid
-    conn.close()
+        category = normalize_category_name(data.get('category'))
+
+        cursor.execute('''
+            INSERT INTO holdings (holding_id, account_type, account, ticker, name, category, 
+                                lookup, shares, cost, current_price, contribution, track_price, track_insights, manual_price_override, value_override, convert_to_cad, cad_conversion_rate)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            holding_id,
+            data['account_type'],
+            data['account'],
+            data['ticker'],
+            data['name'],
+            category,
+            data['lookup'],
+            data['shares'],
+            data['cost'],
+            data['current_price'],
+            contribution,
+            track_price,
+            bool(data.get('track_insights', False)),
+            manual_price_override,
+            data.get('value_override'),
+            bool(data.get('convert_to_cad', False)),
+            data.get('cad_conversion_rate'),
+        ))
+
+        new_holding_id = cursor.lastrowid
 
     ensure_price_history_seed(
         data.get('lookup') or data.get('ticker'),
@@ -532,109 +726,155 @@ def update_holding(id, data):
 
 def delete_holding(id):
     """Soft delete a holding by marking it as deleted"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Get the holding_id of the existing record
-    cursor.execute('SELECT holding_id FROM holdings WHERE id = ?', (id,))
-    result = cursor.fetchone()
-    
-    if not result:
-        conn.close()
-        raise ValueError("Holding not found")
-    
-    holding_id = result['holding_id']
-    
-    # Mark all versions of this holding as deleted
-    cursor.execute('UPDATE holdings SET is_deleted = TRUE WHERE holding_id = ?', (holding_id,))
-    
-    conn.commit()
-    conn.close()
+    with write_conn() as conn:
+        cursor = conn.cursor()
+
+        # Get the holding_id of the existing record
+        cursor.execute('SELECT holding_id FROM holdings WHERE id = ?', (id,))
+        result = cursor.fetchone()
+
+        if not result:
+            raise ValueError("Holding not found")
+
+        holding_id = result['holding_id']
+
+        # Mark all versions of this holding as deleted
+        cursor.execute('UPDATE holdings SET is_deleted = TRUE WHERE holding_id = ?', (holding_id,))
 
 def get_holding_history(holding_id):
     """Get all versions of a holding (including deleted ones)"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT * FROM holdings 
-        WHERE holding_id = ? 
-        ORDER BY last_updated DESC
-    ''', (holding_id,))
-    
-    history = cursor.fetchall()
-    conn.close()
+    with read_conn() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT * FROM holdings 
+            WHERE holding_id = ? 
+            ORDER BY last_updated DESC
+        ''', (holding_id,))
+
+        history = rows_to_dicts(cursor, cursor.fetchall())
     return history
 
+_UPSERT_PRICE_HISTORY = '''
+    INSERT INTO price_history (ticker, price, date, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(ticker, date) DO UPDATE SET
+        price = excluded.price,
+        updated_at = excluded.updated_at
+'''
+
+_UPSERT_PRICE_HISTORY_HOURLY = '''
+    INSERT INTO price_history_hourly (ticker, price, timestamp)
+    VALUES (?, ?, ?)
+    ON CONFLICT(ticker, timestamp) DO UPDATE SET
+        price = excluded.price
+'''
+
+
 def add_price_history(ticker, price, date_override=None, captured_at=None):
     """Add or update price history for a ticker"""
-    conn = get_db()
-    cursor = conn.cursor()
+    with write_conn() as conn:
+        cursor = conn.cursor()
 
-    captured_at = captured_at or datetime.utcnow()
-    date_str = date_override or captured_at.strftime('%Y-%m-%d')
+        captured_at = captured_at or datetime.utcnow()
+        date_str = date_override or captured_at.strftime('%Y-%m-%d')
+
+        cursor.execute(_UPSERT_PRICE_HISTORY, (ticker, price, date_str, captured_at.isoformat()))
 
-    cursor.execute('''
-        INSERT INTO price_history (ticker, price, date, updated_at)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(ticker, date) DO UPDATE SET
-            price = excluded.price,
-            updated_at = excluded.updated_at
-    ''', (ticker, price, date_str, captured_at.isoformat()))
 
-    conn.commit()
-    conn.close()
+def add_price_history_rows(rows):
+    """Upsert many (ticker, price, date, updated_at) daily rows in a single transaction"""
+    rows = list(rows)
+    if not rows:
+        return
+    with write_conn() as conn:
+        conn.executemany(_UPSERT_PRICE_HISTORY, rows)
 
 
 def add_price_history_hourly(ticker, price, timestamp=None):
     """Add or update hourly price history for a ticker"""
-    conn = get_db()
-    cursor = conn.cursor()
+    with write_conn() as conn:
+        cursor = conn.cursor()
 
-    timestamp = timestamp or datetime.utcnow()
-    ts = timestamp.replace(microsecond=0).isoformat()
+        timestamp = timestamp or datetime.utcnow()
+        ts = timestamp.replace(microsecond=0).isoformat()
+
+        cursor.execute(_UPSERT_PRICE_HISTORY_HOURLY, (ticker, price, ts))
+
+
+def add_price_history_bulk(prices, captured_at=None):
+    """Record daily and hourly prices for many tickers in a single transaction.
+
+    `prices` is an iterable of (ticker, price) pairs sharing one capture time.
+    Aware capture times are stored as naive UTC like the rest of price_history.
+    """
+    captured_at = captured_at or datetime.utcnow()
+    if captured_at.tzinfo is not None:
+        captured_at = captured_at.astimezone(timezone.utc).replace(tzinfo=None)
+    date_str = captured_at.strftime('%Y-%m-%d')
+    updated_at = captured_at.isoformat()
+    ts = captured_at.replace(microsecond=0).isoformat()
+    prices = list(prices)
+    if not prices:
+        return
+
+    with write_conn() as conn:
+        conn.executemany(
+            _UPSERT_PRICE_HISTORY,
+            [(ticker, price, date_str, updated_at) for ticker, price in prices],
+        )
+        conn.executemany(
+            _UPSERT_PRICE_HISTORY_HOURLY,
+            [(ticker, price, ts) for ticker, price in prices],
+        )
+
+def get_ticker_name(ticker: str) -> str | None:
+    """Get the stored display name for a ticker"""
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT name FROM ticker_names WHERE ticker = ?', (ticker,))
+        row = cursor.fetchone()
+    return row['name'] if row else None
+
+
+def upsert_ticker_name(ticker: str, name: str):
+    """Store the display name for a ticker"""
+    with write_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO ticker_names (ticker, name, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(ticker) DO UPDATE SET
+                name = excluded.name,
+                updated_at = excluded.updated_at
+        ''', (ticker, name))
+
+
+def _empty_series() -> dict:
+    return {'timestamps': [], 'values': []}
+
+
+def _limit_series(series: dict, limit: int) -> dict:
+    """Keep the newest `limit` points of a {'timestamps': [...], 'values': [...]} series."""
+    if len(series['timestamps']) > limit:
+        return {'timestamps': series['timestamps'][-limit:], 'values': series['values'][-limit:]}
+    return series
 
-    cursor.execute('''
-        INSERT INTO price_history_hourly (ticker, price, timestamp)
-        VALUES (?, ?, ?)
-        ON CONFLICT(ticker, timestamp) DO UPDATE SET
-            price = excluded.price
-    ''', (ticker, price, ts))
-
-    conn.commit()
-    conn.close()
-
-def get_price_history(ticker, days=30):
-    """Get price history for a ticker for the last N days"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT date, price FROM price_history 
-        WHERE ticker = ? 
-        ORDER BY date DESC 
-        LIMIT ?
-    ''', (ticker, days))
-    
-    history = cursor.fetchall()
-    conn.close()
-    return history
 
 def get_portfolio_history(days=30, user_id: str | None = None):
     """Get portfolio value history for the last N days using price history snapshots"""
-    conn = get_db()
-    cursor = conn.cursor()
+    with read_conn() as conn:
+        cursor = conn.cursor()
 
-    holdings = _get_holdings_snapshot(cursor, user_id)
-    price_rows = _get_price_rows(cursor, days, user_id)
-    conn.close()
+        holdings = _get_holdings_snapshot(cursor, user_id)
+        price_rows = _get_price_rows(cursor, days, user_id)
 
     if not price_rows:
-        return []
+        return _empty_series()
 
     price_map, sorted_dates = _build_price_map(price_rows)
 
-    history = []
+    values = []
     for date_key in sorted_dates:
         total_value = 0
         for holding in holdings:
@@ -642,22 +882,18 @@ def get_portfolio_history(days=30, user_id: str | None = None):
             price_entry = price_map.get((symbol, date_key)) if symbol else None
             historical_price = price_entry['price'] if price_entry else None
             total_value += _calculate_holding_value(holding, historical_price)
-        history.append({'date': date_key, 'value': total_value})
+        values.append(total_value)
 
-    if len(history) > days:
-        history = history[-days:]
-
-    return history
+    return _limit_series({'timestamps': sorted_dates, 'values': values}, days)
 
 
 def get_account_type_history(days=30, user_id: str | None = None):
     """Get per-account-type value history for sparklines"""
-    conn = get_db()
-    cursor = conn.cursor()
+    with read_conn() as conn:
+        cursor = conn.cursor()
 
-    holdings = _get_holdings_snapshot(cursor, user_id)
-    price_rows = _get_price_rows(cursor, days, user_id)
-    conn.close()
+        holdings = _get_holdings_snapshot(cursor, user_id)
+        price_rows = _get_price_rows(cursor, days, user_id)
 
     if not price_rows:
         return {}
@@ -676,14 +912,12 @@ def get_account_type_history(days=30, user_id: str | None = None):
             daily_totals[account_type] = daily_totals.get(account_type, 0) + value
 
         for account_type, value in daily_totals.items():
-            history_by_account.setdefault(account_type, []).append({'date': date_key, 'value': value})
+            series = history_by_account.setdefault(account_type, _empty_series())
+            series['timestamps'].append(date_key)
+            series['values'].append(value)
 
     # Ensure histories are limited to requested days
-    for account_type, history in history_by_account.items():
-        if len(history) > days:
-            history_by_account[account_type] = history[-days:]
-
-    return history_by_account
+    return {account_type: _limit_series(series, days) for account_type, series in history_by_account.items()}
 
 
 def _get_price_rows_hourly(cursor, hours, user_id: str | None = None):
@@ -700,15 +934,14 @@ def _get_price_rows_hourly(cursor, hours, user_id: str | None = None):
 
 def get_portfolio_history_hourly(hours=168, user_id: str | None = None):
     """Get portfolio value history for the last N hours using hourly snapshots"""
-    conn = get_db()
-    cursor = conn.cursor()
+    with read_conn() as conn:
+        cursor = conn.cursor()
 
-    holdings = _get_holdings_snapshot(cursor, user_id)
-    price_rows = _get_price_rows_hourly(cursor, hours, user_id)
-    conn.close()
+        holdings = _get_holdings_snapshot(cursor, user_id)
+        price_rows = _get_price_rows_hourly(cursor, hours, user_id)
 
     if not price_rows:
-        return []
+        return _empty_series()
 
     price_map = {}
     unique_timestamps = []
@@ -719,7 +952,7 @@ def get_portfolio_history_hourly(hours=168, user_id: str | None = None):
         if not unique_timestamps or unique_timestamps[-1] != timestamp:
             unique_timestamps.append(timestamp)
 
-    history = []
+    values = []
     for ts in unique_timestamps:
         total_value = 0
         for holding in holdings:
@@ -727,22 +960,18 @@ def get_portfolio_history_hourly(hours=168, user_id: str | None = None):
             price = price_map.get((symbol, ts)) if symbol else None
             historical_price = price if price is not None else None
             total_value += _calculate_holding_value(holding, historical_price)
-        history.append({'timestamp': ts, 'value': total_value})
-
-    if len(history) > hours:
-        history = history[-hours:]
+        values.append(total_value)
 
-    return history
+    return _limit_series({'timestamps': unique_timestamps, 'values': values}, hours)
 
 
 def get_account_type_history_hourly(hours=168, user_id: str | None = None):
     """Get per-account-type hourly value history"""
-    conn = get_db()
-    cursor = conn.cursor()
+    with read_conn() as conn:
+        cursor = conn.cursor()
 
-    holdings = _get_holdings_snapshot(cursor)
-    price_rows = _get_price_rows_hourly(cursor, hours)
-    conn.close()
+        holdings = _get_holdings_snapshot(cursor)
+        price_rows = _get_price_rows_hourly(cursor, hours)
 
     if not price_rows:
         return {}
@@ -768,13 +997,11 @@ def get_account_type_history_hourly(hours=168, user_id: str | None = None):
             daily_totals[account_type] = daily_totals.get(account_type, 0) + value
 
         for account_type, value in daily_totals.items():
-            history_by_account.setdefault(account_type, []).append({'timestamp': ts, 'value': value})
-
-    for account_type, history in history_by_account.items():
-        if len(history) > hours:
-            history_by_account[account_type] = history[-hours:]
+            series = history_by_account.setdefault(account_type, _empty_series())
+            series['timestamps'].append(ts)
+            series['values'].append(value)
 
-    return history_by_account
+    return {account_type: _limit_series(series, hours) for account_type, series in history_by_account.items()}
 
 
 def _ensure_utc(dt: datetime) -> datetime:
@@ -786,133 +1013,164 @@ def _ensure_utc(dt: datetime) -> datetime:
 def add_portfolio_snapshot(stats: dict, captured_at: datetime | None = None, user_id: str = 'default'):
     """Persist a portfolio-level aggregate snapshot for later movement calculations."""
     captured_at = _ensure_utc(captured_at or datetime.utcnow())
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO portfolio_snapshots (user_id, captured_at, total_value, total_contribution, total_gain, total_gain_percent)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (
-        user_id,
-        captured_at.replace(microsecond=0).isoformat(),
-        float(stats.get('total_value', 0)),
-        float(stats.get('total_cost') if stats.get('total_cost') is not None else stats.get('total_contribution', 0)),
-        float(stats.get('total_gain', 0)),
-        float(stats.get('total_gain_percent', 0)),
-    ))
-    conn.commit()
-    conn.close()
+    with write_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO portfolio_snapshots (user_id, captured_at, total_value, total_contribution, total_gain, total_gain_percent)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            user_id,
+            captured_at.replace(microsecond=0).isoformat(),
+            float(stats.get('total_value', 0)),
+            float(stats.get('total_cost') if stats.get('total_cost') is not None else stats.get('total_contribution', 0)),
+            float(stats.get('total_gain', 0)),
+            float(stats.get('total_gain_percent', 0)),
+        ))
 
 
 def get_portfolio_snapshots_since(start_time: datetime | None = None, user_id: str = 'default') -> list[dict]:
     """Get all portfolio snapshots since a given datetime for a specific user"""
-    conn = get_db()
-    cursor = conn.cursor()
-    if start_time:
-        cursor.execute('''
-            SELECT * FROM portfolio_snapshots
-            WHERE user_id = ? AND captured_at >= ?
-            ORDER BY captured_at ASC
-        ''', (user_id, start_time.isoformat()))
-    else:
-        cursor.execute('''
-            SELECT * FROM portfolio_snapshots
-            WHERE user_id = ?
-            ORDER BY captured_at ASC
-        ''', (user_id,))
-    snapshots = cursor.fetchall()
-    conn.close()
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        if start_time:
+            cursor.execute('''
+                SELECT * FROM portfolio_snapshots
+                WHERE user_id = ? AND captured_at >= ?
+                ORDER BY captured_at ASC
+            ''', (user_id, start_time.isoformat()))
+        else:
+            cursor.execute('''
+                SELECT * FROM portfolio_snapshots
+                WHERE user_id = ?
+                ORDER BY captured_at ASC
+            ''', (user_id,))
+        snapshots = cursor.fetchall()
     return snapshots
 
 
 def get_portfolio_snapshot_before(before: datetime, user_id: str = 'default'):
     """Get the latest portfolio snapshot before a given datetime for a specific user"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT * FROM portfolio_snapshots
-        WHERE user_id = ? AND captured_at <= ?
-        ORDER BY captured_at DESC
-        LIMIT 1
-    ''', (user_id, before.isoformat()))
-    snapshot = cursor.fetchone()
-    conn.close()
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT * FROM portfolio_snapshots
+            WHERE user_id = ? AND captured_at <= ?
+            ORDER BY captured_at DESC
+            LIMIT 1
+        ''', (user_id, before.isoformat()))
+        snapshot = cursor.fetchone()
     return snapshot
 
 
+def get_movement_snapshots(user_id: str = 'default', start_time: datetime | None = None):
+    """Get (prior, in_range) snapshots for a movement window in one query.
+
+    `in_range` holds every snapshot captured at or after start_time (all of them
+    when start_time is None); `prior` is the latest snapshot before start_time,
+    or None. Timestamps stay as stored ISO-8601 UTC strings, which sort
+    lexicographically.
+    """
+    start_iso = start_time.isoformat() if start_time else ''
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            WITH prior AS (
+                SELECT captured_at, total_value
+                FROM portfolio_snapshots
+                WHERE user_id = ? AND captured_at < ?
+                ORDER BY captured_at DESC
+                LIMIT 1
+            ),
+            in_range AS (
+                SELECT captured_at, total_value
+                FROM portfolio_snapshots
+                WHERE user_id = ? AND captured_at >= ?
+            )
+            SELECT 1 AS is_prior, captured_at, total_value FROM prior
+            UNION ALL
+            SELECT 0 AS is_prior, captured_at, total_value FROM in_range
+            ORDER BY captured_at ASC
+        ''', (user_id, start_iso, user_id, start_iso))
+        rows = cursor.fetchall()
+
+    prior = None
+    in_range = []
+    for is_prior, captured_at, total_value in rows:
+        snapshot = {'captured_at': captured_at, 'total_value': total_value}
+        if is_prior:
+            prior = snapshot
+        else:
+            in_range.append(snapshot)
+    return prior, in_range
+
+
 def get_latest_portfolio_snapshot(user_id: str = 'default'):
     """Get the latest portfolio snapshot for a specific user"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT * FROM portfolio_snapshots
-        WHERE user_id = ?
-        ORDER BY captured_at DESC
-        LIMIT 1
-    ''', (user_id,))
-    snapshot = cursor.fetchone()
-    conn.close()
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT * FROM portfolio_snapshots
+            WHERE user_id = ?
+            ORDER BY captured_at DESC
+            LIMIT 1
+        ''', (user_id,))
+        snapshot = cursor.fetchone()
     return dict(snapshot) if snapshot else None
 
 
 def get_price_history(ticker: str, days: int = 30):
     """Get price history for a specific ticker (shared across users)"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT date, price
-        FROM price_history
-        WHERE ticker = ?
-        ORDER BY date DESC
-        LIMIT ?
-    ''', (ticker, days))
-    history = cursor.fetchall()
-    conn.close()
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT date, price
+            FROM price_history
+            WHERE ticker = ?
+            ORDER BY date DESC
+            LIMIT ?
+        ''', (ticker, days))
+        history = rows_to_dicts(cursor, cursor.fetchall())
     return history
 
 
 def get_price_history_hourly(ticker: str, hours: int = 168):
     """Get hourly price history for a specific ticker (shared across users)"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT timestamp, price
-        FROM price_history_hourly
-        WHERE ticker = ?
-        ORDER BY timestamp ASC
-        LIMIT ?
-    ''', (ticker, hours))
-    history = cursor.fetchall()
-    conn.close()
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT timestamp, price
+            FROM price_history_hourly
+            WHERE ticker = ?
+            ORDER BY timestamp ASC
+            LIMIT ?
+        ''', (ticker, hours))
+        history = rows_to_dicts(cursor, cursor.fetchall())
     return history
 
 
 # User info CRUD
 def get_all_users():
     """Get all users from the user_info table."""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM user_info ORDER BY created_at ASC')
-    users = cursor.fetchall()
-    conn.close()
-    return [dict(u) for u in users]
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM user_info ORDER BY created_at ASC')
+        users = rows_to_dicts(cursor, cursor.fetchall())
+    return users
 
 def get_user_by_id(user_id: str):
     """Get a user by user_id."""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM user_info WHERE user_id = ?', (user_id,))
-    user = cursor.fetchone()
-    conn.close()
+    with read_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM user_info WHERE user_id = ?', (user_id,))
+        user = cursor.fetchone()
     return dict(user) if user else None
 
 def create_user(user_id: str, display_name: str, email: str | None = None):
     """Create a new user."""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO user_info (user_id, display_name, email) VALUES (?, ?, ?)',
-                   (user_id, display_name, email))
-    conn.commit()
-    conn.close()
+    with write_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('INSERT INTO user_info (user_id, display_name, email) VALUES (?, ?, ?)',
+                       (user_id, display_name, email))
     return get_user_by_id(user_id)
 
 if __name__ == '__main__':
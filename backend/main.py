@@ -1,12 +1,15 @@
-from fastapi import FastAPI, Request, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import Body, FastAPI, Request, Form, HTTPException
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
 import sqlite3
+import numpy as np
+import pandas as pd
 import yfinance as yf
 import argparse
-from typing import Optional, List, Literal, Dict
+from typing import Optional, List, Literal, Dict, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,38 +17,48 @@ load_dotenv()
 from database import (
     get_db,
     init_db,
+    close_connections,
     get_all_holdings,
-    get_all_holdings_for_user,
+    get_insight_symbols,
+    get_active_holdings,
+    get_capture_symbols,
+    get_holdings_cache_state,
+    get_portfolio_aggregates,
     get_holding_by_id,
     create_holding,
     update_holding,
     delete_holding,
     get_holding_history,
     add_price_history,
-    add_price_history_hourly,
+    add_price_history_bulk,
+    get_ticker_name,
+    upsert_ticker_name,
     get_price_history,
     get_portfolio_history,
     get_account_type_history,
     get_portfolio_history_hourly,
     get_account_type_history_hourly,
     add_portfolio_snapshot,
-    get_portfolio_snapshots_since,
-    get_portfolio_snapshot_before,
-    get_latest_portfolio_snapshot,
+    get_movement_snapshots,
     get_all_users,
     get_user_by_id,
     create_user,
     upsert_current_insight,
     get_current_insights,
 )
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-import pytz
-from datetime import datetime, time, timedelta, timezone
+from apscheduler.triggers.interval import IntervalTrigger
+from zoneinfo import ZoneInfo
+from datetime import date, datetime, time, timedelta, timezone
+import asyncio
+from collections import OrderedDict
 import json
+import threading
+from time import monotonic
 
 from agent_runner import run_insights_pipeline
-from agent_tools import get_stock_price_info
+from agent_tools import YF_SESSION, YF_TIMEOUT, StockQuote, get_stock_price_info
 MARKET_INDEXES: List[Dict[str, str]] = [
     {"id": "sp500", "symbol": "^GSPC", "name": "S&P 500"},
     {"id": "dow", "symbol": "^DJI", "name": "Dow Jones"},
@@ -54,7 +67,35 @@ MARKET_INDEXES: List[Dict[str, str]] = [
 
 DEFAULT_USER_ID = 'user_alex'
 
-app = FastAPI(title="Portfolio Tracker", description="A simple web application to track investment holdings")
+# Max concurrent yfinance lookups during a scheduled price capture
+CAPTURE_FETCH_CONCURRENCY = 16
+# Upper bounds for awaiting yfinance work so one hung symbol cannot stall the rest
+PRICE_FETCH_TIMEOUT_SECONDS = 10
+BULK_FETCH_TIMEOUT_SECONDS = 30
+
+# In-memory price snapshot kept warm by the scheduler: {ticker: (price, name, fetched_at)}
+PRICE_CACHE_REFRESH_MINUTES = 5
+PRICE_CACHE_MAX_AGE = timedelta(minutes=10)
+PRICE_CACHE_CLOSED_MAX_AGE = timedelta(hours=1)  # quotes barely move outside market hours
+PRICE_CACHE: Dict[str, tuple[float, Optional[str], datetime]] = {}
+_price_cache_lock = threading.Lock()
+
+# Market index summary served by /api/market-summary, rebuilt by the scheduler
+MARKET_SUMMARY_REFRESH_SECONDS = 60
+MARKET_SUMMARY_CLOSED_REFRESH_SECONDS = 300
+_market_summary_cache: Dict[str, object] = {}  # {"indexes": [...], "fetched_at": monotonic seconds}
+
+# Display names backed by the ticker_names table: {ticker: name or None}
+TICKER_NAMES: Dict[str, Optional[str]] = {}
+
+# Last-resort history closes: {(ticker, utc_date): close}
+DAILY_CLOSE_CACHE: Dict[tuple[str, date], float] = {}
+
+app = FastAPI(
+    title="Portfolio Tracker",
+    description="A simple web application to track investment holdings",
+    default_response_class=ORJSONResponse,
+)
 
 # Configure CORS
 app.add_middleware(
@@ -68,12 +109,26 @@ app.add_middleware(
 # Setup templates
 templates = Jinja2Templates(directory="templates")
 
-# Initialize scheduler
-scheduler = BackgroundScheduler()
-scheduler.start()
+# Initialize scheduler; it is started on startup so async jobs run on uvicorn's event loop
+scheduler = AsyncIOScheduler()
+
+
+@app.on_event("startup")
+async def start_scheduler():
+    if not scheduler.running:
+        scheduler.start()
+
+
+@app.on_event("shutdown")
+def close_database_connections():
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    close_connections()
 
 # Pydantic models for API
 class HoldingCreate(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     account_type: str
     account: str
     ticker: str = ""
@@ -90,6 +145,8 @@ class HoldingCreate(BaseModel):
     value_override: Optional[float] = None
 
 class HoldingUpdate(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     account_type: str
     account: str
     ticker: str = ""
@@ -104,6 +161,31 @@ class HoldingUpdate(BaseModel):
     manual_price_override: bool = False
     value_override: Optional[float] = None
 
+# Holding payloads are validated against adapters built once at import rather
+# than through FastAPI's per-route model handling.
+HOLDING_CREATE_ADAPTER = TypeAdapter(HoldingCreate)
+HOLDING_UPDATE_ADAPTER = TypeAdapter(HoldingUpdate)
+
+
+def _body_openapi(adapter: TypeAdapter) -> dict:
+    """openapi_extra documenting a raw dict body with the adapter's model schema."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": adapter.json_schema()}},
+        }
+    }
+
+
+def _validate_payload(adapter: TypeAdapter, payload: dict):
+    """Validate a raw request body, surfacing failures as the usual 422."""
+    try:
+        return adapter.validate_python(payload)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, 'loc': ('body', *error['loc'])} for error in e.errors(include_url=False)]
+        )
+
 class PriceRequest(BaseModel):
     ticker: str
 
@@ -116,24 +198,55 @@ class InsightRunRequest(BaseModel):
 class InsightRefreshRequest(BaseModel):
     user_id: Optional[str] = None
 
+EST_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN_TIME = time(9, 0)  # 9:00 AM
+MARKET_CLOSE_TIME = time(17, 0)  # 5:00 PM
+MARKET_STATUS_TTL_SECONDS = 30
+_market_status_checked_at: Optional[float] = None
+_market_status: bool = False
+
+
 def is_market_open() -> bool:
-    """Check if market is open (weekdays 9AM-5PM EST)"""
-    est = pytz.timezone('US/Eastern')
-    now = datetime.now(est)
-    
-    # Check if it's a weekday (0=Monday, 6=Sunday)
-    if now.weekday() >= 5:  # Saturday or Sunday
-        return False
-    
-    # Check if time is between 9AM and 5PM EST
-    market_open = time(9, 0)  # 9:00 AM
-    market_close = time(17, 0)  # 5:00 PM
-    current_time = now.time()
+    """Check if market is open (weekdays 9AM-5PM EST), re-evaluated at most every 30s"""
+    global _market_status_checked_at, _market_status
+    checked_at = monotonic()
+    if _market_status_checked_at is not None and checked_at - _market_status_checked_at < MARKET_STATUS_TTL_SECONDS:
+        return _market_status
+
+    now = datetime.now(EST_TZ)
     
-    return market_open <= current_time <= market_close
+    # Weekdays only (0=Monday, 6=Sunday), between 9AM and 5PM EST
+    is_open = now.weekday() < 5 and MARKET_OPEN_TIME <= now.time() <= MARKET_CLOSE_TIME
+
+    _market_status_checked_at, _market_status = checked_at, is_open
+    return is_open
+
+async def _fetch_capture_price(symbol: str, fetch_sem: asyncio.Semaphore):
+    # The slot stays taken until the fetch thread ends, so hung fetches that
+    # outlive the timeout still count towards CAPTURE_FETCH_CONCURRENCY
+    await fetch_sem.acquire()
+    return await _run_blocking_holding_slot(
+        fetch_sem, PRICE_FETCH_TIMEOUT_SECONDS, "Price fetch timeout", fetch_price, symbol, True
+    )
 
-def capture_portfolio_prices():
-    """Capture prices for all holdings and store in history"""
+
+async def _fetch_prices_bulk_with_timeout(symbols: List[str]) -> Dict[str, tuple[float, Optional[float]]]:
+    """Batched download bounded by BULK_FETCH_TIMEOUT_SECONDS; a timeout yields no prices."""
+    try:
+        return await _run_blocking_with_timeout(
+            BULK_FETCH_TIMEOUT_SECONDS, "Bulk price download timeout", fetch_prices_bulk, symbols
+        )
+    except TimeoutError as e:
+        print(f"{e} for {len(symbols)} symbols")
+        return {}
+
+
+async def capture_portfolio_prices_async():
+    """Capture prices for all holdings and store in history.
+
+    Distinct lookup symbols are priced with one batched download; symbols it
+    misses are fetched individually, up to CAPTURE_FETCH_CONCURRENCY at a time.
+    """
     if not is_market_open():
         print(f"[{datetime.now()}] Market is closed, skipping price capture")
         return
@@ -141,35 +254,63 @@ def capture_portfolio_prices():
     print(f"[{datetime.now()}] Starting portfolio price capture...")
     
     try:
-        holdings = [dict(row) for row in get_all_holdings()]
-        captured_count = 0
-        
-        for holding in holdings:
-            if holding['lookup'] and holding['lookup'].strip():
-                price, name = fetch_price(holding['lookup'])
-                if price is not None:
-                    captured_at = datetime.utcnow()
-                    add_price_history(holding['lookup'], price, captured_at=captured_at)
-                    add_price_history_hourly(holding['lookup'], price, timestamp=captured_at)
-                    captured_count += 1
-                    print(f"Captured {holding['lookup']}: ${price}")
-                else:
-                    print(f"Failed to fetch price for {holding['ticker']}")
+        # SQLite calls run off the event loop so a write-lock wait can't stall it
+        symbols = await asyncio.to_thread(get_capture_symbols)
+        # One batched download covers most symbols; anything it misses falls
+        # back to concurrent per-ticker lookups.
+        bulk_prices = await _fetch_prices_bulk_with_timeout(symbols)
+        results = {}
+        for symbol, (price, _) in bulk_prices.items():
+            _store_cached_price(symbol, price, _cached_name(symbol))
+            results[symbol] = (price, None)
+
+        missing = [symbol for symbol in symbols if symbol not in results]
+        fetch_sem = asyncio.Semaphore(CAPTURE_FETCH_CONCURRENCY)
+        fallback_results = await asyncio.gather(
+            *(_fetch_capture_price(symbol, fetch_sem) for symbol in missing),
+            return_exceptions=True,
+        )
+        results.update(zip(missing, fallback_results))
+
+        captured = []
+        for symbol in symbols:
+            result = results[symbol]
+            if isinstance(result, Exception):
+                print(f"Failed to fetch price for {symbol}: {result}")
+                continue
+            price, _ = result
+            if price is not None:
+                captured.append((symbol, price))
+                print(f"Captured {symbol}: ${price}")
+            else:
+                print(f"Failed to fetch price for {symbol}")
+
+        # One capture time shared by every price row and the snapshot
+        captured_at = datetime.now(timezone.utc)
+        await asyncio.to_thread(add_price_history_bulk, captured, captured_at=captured_at)
+        bump_portfolio_version()
         
-        latest_holdings = [dict(row) for row in get_all_holdings()]
-        _, portfolio_stats = enrich_holdings_with_calculations(latest_holdings)
-        add_portfolio_snapshot(portfolio_stats, captured_at=datetime.utcnow(), user_id=DEFAULT_USER_ID)
+        # Totals come straight from SQL; no per-holding enrichment is needed
+        portfolio_stats = await asyncio.to_thread(get_portfolio_stats, None)
+        await asyncio.to_thread(
+            add_portfolio_snapshot, portfolio_stats, captured_at=captured_at, user_id=DEFAULT_USER_ID
+        )
 
-        print(f"Price capture completed. Captured {captured_count} prices.")
+        print(f"Price capture completed. Captured {len(captured)} prices.")
         
     except Exception as e:
         print(f"Error during price capture: {e}")
 
+
+def capture_portfolio_prices():
+    """Synchronous entry point for scripts."""
+    asyncio.run(capture_portfolio_prices_async())
+
 def setup_scheduler():
     """Setup the scheduled job for price capture"""
     # Schedule job to run at 5 minutes past every hour, Monday-Friday
     scheduler.add_job(
-        capture_portfolio_prices,
+        capture_portfolio_prices_async,
         CronTrigger(
             minute="5",  # 5th minute of the hour
             hour="9-17",  # 9 AM to 5 PM
@@ -181,6 +322,24 @@ def setup_scheduler():
     )
     print("Scheduler setup complete. Price capture scheduled for weekdays 9:05 AM - 5:05 PM EST")
 
+    scheduler.add_job(
+        refresh_price_cache,
+        IntervalTrigger(minutes=PRICE_CACHE_REFRESH_MINUTES),
+        id="price_cache_refresh",
+        name="Price Cache Refresh",
+        replace_existing=True,
+    )
+    print(f"Scheduler setup complete. Price cache refresh scheduled every {PRICE_CACHE_REFRESH_MINUTES} minutes")
+
+    scheduler.add_job(
+        refresh_market_summary,
+        IntervalTrigger(seconds=MARKET_SUMMARY_REFRESH_SECONDS),
+        id="market_summary_refresh",
+        name="Market Summary Refresh",
+        replace_existing=True,
+    )
+    print("Scheduler setup complete. Market summary refresh scheduled every minute (every 5 minutes when closed)")
+
     # Schedule daily insights refresh (default 7:30 AM EST, every day)
     scheduler.add_job(
         refresh_tracked_insights_job,
@@ -196,111 +355,188 @@ def setup_scheduler():
     print("Scheduler setup complete. Insights refresh scheduled daily at 7:30 AM EST")
 
 
-def refresh_tracked_insights_for_user(user_id: str) -> dict:
-    """Run the insights pipeline for all holdings that track insights.
-    
-    If Ollama server is unavailable, preserves existing insights instead of failing.
-    Only tries once per ticker with proper timeout handling.
+INSIGHTS_YAHOO_CONCURRENCY = 8
+INSIGHTS_OLLAMA_CONCURRENCY = 2  # Ollama serves one local GPU; keep LLM calls nearly serial
+INSIGHTS_PRICE_TIMEOUT_SECONDS = 30
+INSIGHTS_PIPELINE_TIMEOUT_SECONDS = 60
+
+OLLAMA_ERROR_KEYWORDS = (
+    "connection refused",
+    "ollama",
+    "127.0.0.1:11434",
+    "connection error",
+    "timeout",
+    "unreachable",
+)
+DELISTED_ERROR_KEYWORDS = (
+    "delisted",
+    "no data found",
+    "no price data",
+    "symbol may be delisted",
+)
+
+
+async def _run_blocking_with_timeout(timeout: float, timeout_message: str, func, *args):
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(func, *args), timeout=timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(timeout_message) from None
+
+
+async def _run_blocking_holding_slot(slot: asyncio.Semaphore, timeout: float, timeout_message: str, func, *args):
+    """Run func in a thread with a timeout, keeping an already-acquired slot until the thread ends.
+
+    A timeout only abandons the wait: the worker thread keeps running, so the
+    slot is released from the worker's done-callback rather than on exit.
     """
-    holdings = [dict(row) for row in get_all_holdings_for_user(user_id)]
-    refreshed: list[str] = []
-    errors: list[dict[str, str]] = []
-    ollama_unavailable = False
+    worker = asyncio.ensure_future(asyncio.to_thread(func, *args))
 
-    for holding in holdings:
-        if not holding.get("track_insights"):
-            continue
-        symbol = (holding.get("lookup") or holding.get("ticker") or "").strip()
-        if not symbol:
-            continue
-        
-        # If Ollama was previously detected as unavailable, skip further attempts
-        if ollama_unavailable:
-            errors.append({
-                "symbol": symbol, 
-                "error": "Skipped: Ollama server unavailable, preserving existing insight"
+    def release(task: asyncio.Future):
+        slot.release()
+        if not task.cancelled():
+            task.exception()  # retrieved so a failure after a timeout is not reported as unhandled
+
+    worker.add_done_callback(release)
+    try:
+        return await asyncio.wait_for(asyncio.shield(worker), timeout=timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(timeout_message) from None
+
+
+async def _fetch_insight_quotes(symbols: List[str]) -> Dict[str, StockQuote]:
+    """Quotes for many symbols from one batched download.
+
+    Symbols without both a last and a previous close are left out; callers fall
+    back to get_stock_price_info for those.
+    """
+    quotes = {}
+    for symbol, (price, previous) in (await _fetch_prices_bulk_with_timeout(symbols)).items():
+        if price > 0 and previous:
+            quotes[symbol] = StockQuote(symbol=symbol.upper(), current_price=price, previous_close=previous)
+    return quotes
+
+
+async def _refresh_insight(
+    symbol: str,
+    user_results: List[Tuple[str, dict]],
+    yahoo_sem: asyncio.Semaphore,
+    ollama_sem: asyncio.Semaphore,
+    ollama_unavailable: asyncio.Event,
+    quote: Optional[StockQuote] = None,
+):
+    """Refresh one symbol's insight for every (user_id, result) tracking it.
+
+    The quote and pipeline run once per symbol; Yahoo lookups overlap with the
+    (bounded) LLM calls of other symbols.
+    """
+    def record_error(error: dict):
+        for _, result in user_results:
+            result["errors"].append(error)
+
+    skipped_error = {
+        "symbol": symbol,
+        "error": "Skipped: Ollama server unavailable, preserving existing insight"
+    }
+    # If Ollama was previously detected as unavailable, skip further attempts
+    if ollama_unavailable.is_set():
+        record_error(skipped_error)
+        return
+
+    print(f"[{datetime.utcnow().isoformat()}] Processing insights for {symbol}...")
+
+    try:
+        if quote is None:
+            async with yahoo_sem:
+                quote = await _run_blocking_with_timeout(
+                    INSIGHTS_PRICE_TIMEOUT_SECONDS, "Price fetch timeout", get_stock_price_info, symbol
+                )
+        print(f"[{datetime.utcnow().isoformat()}] {symbol}: Price fetched - Current: {quote.current_price}, Previous: {quote.previous_close}")
+
+        # The Ollama slot is held until the pipeline thread finishes, even if
+        # we stop waiting on it, so timed-out runs still count towards the limit
+        await ollama_sem.acquire()
+        if ollama_unavailable.is_set():
+            ollama_sem.release()
+            record_error(skipped_error)
+            return
+        insight = await _run_blocking_holding_slot(
+            ollama_sem,
+            INSIGHTS_PIPELINE_TIMEOUT_SECONDS,
+            "AI processing timeout",
+            run_insights_pipeline,
+            symbol,
+            quote.current_price,
+            quote.previous_close or quote.current_price,
+        )
+        print(f"[{datetime.utcnow().isoformat()}] {symbol}: AI analysis completed")
+        print(f"[{datetime.utcnow().isoformat()}] {symbol}: Summary - {insight['summary'][:100]}...")
+        for user_id, result in user_results:
+            await asyncio.to_thread(_save_insight, user_id, symbol, insight["summary"], insight["analysis"])
+            result["refreshed"].append(symbol.upper())
+        print(f"[{datetime.utcnow().isoformat()}] {symbol}: ✓ Insight saved successfully")
+
+    except TimeoutError as exc:
+        print(f"[{datetime.utcnow().isoformat()}] {symbol}: ✗ Timeout - {str(exc)}")
+        record_error({"symbol": symbol, "error": f"Timeout: {str(exc)}"})
+    except Exception as exc:
+        error_str = str(exc).lower()
+        print(f"[{datetime.utcnow().isoformat()}] {symbol}: ✗ Error - {str(exc)}")
+
+        # Check for Ollama-specific connection errors
+        if any(keyword in error_str for keyword in OLLAMA_ERROR_KEYWORDS):
+            ollama_unavailable.set()
+            record_error({
+                "symbol": symbol,
+                "error": "Ollama server unavailable - preserving existing insights for all remaining tickers"
             })
-            continue
-            
-        print(f"[{datetime.utcnow().isoformat()}] Processing insights for {symbol}...")
-        
-        try:
-            # Add timeout handling for price fetching
-            import signal
-            
-            def timeout_handler(signum, frame):
-                raise TimeoutError("Price fetch timeout")
-            
-            # Set a 30-second timeout for price fetching
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(30)
-            
-            try:
-                quote = get_stock_price_info(symbol)
-                print(f"[{datetime.utcnow().isoformat()}] {symbol}: Price fetched - Current: {quote.current_price}, Previous: {quote.previous_close}")
-            finally:
-                signal.alarm(0)  # Cancel the alarm
-            
-            # Run insights pipeline with timeout
-            signal.alarm(60)  # 60-second timeout for AI processing
-            
-            try:
-                result = run_insights_pipeline(symbol, quote.current_price, quote.previous_close or quote.current_price)
-                print(f"[{datetime.utcnow().isoformat()}] {symbol}: AI analysis completed")
-                print(f"[{datetime.utcnow().isoformat()}] {symbol}: Summary - {result['summary'][:100]}...")
-                _save_insight(user_id, symbol, result["summary"], result["analysis"])
-                refreshed.append(symbol.upper())
-                print(f"[{datetime.utcnow().isoformat()}] {symbol}: ✓ Insight saved successfully")
-            finally:
-                signal.alarm(0)  # Cancel the alarm
-                
-        except TimeoutError as exc:
-            print(f"[{datetime.utcnow().isoformat()}] {symbol}: ✗ Timeout - {str(exc)}")
-            errors.append({"symbol": symbol, "error": f"Timeout: {str(exc)}"})
-        except Exception as exc:
-            error_str = str(exc).lower()
-            print(f"[{datetime.utcnow().isoformat()}] {symbol}: ✗ Error - {str(exc)}")
-            
-            # Check for Ollama-specific connection errors
-            if any(keyword in error_str for keyword in [
-                "connection refused", 
-                "ollama", 
-                "127.0.0.1:11434",
-                "connection error",
-                "timeout",
-                "unreachable"
-            ]):
-                ollama_unavailable = True
-                errors.append({
-                    "symbol": symbol, 
-                    "error": "Ollama server unavailable - preserving existing insights for all remaining tickers"
-                })
-                print(f"[{datetime.utcnow().isoformat()}] Ollama server unavailable during insights refresh for {symbol}. Preserving existing insights.")
-            elif any(keyword in error_str for keyword in [
-                "delisted",
-                "no data found",
-                "no price data",
-                "symbol may be delisted"
-            ]):
-                errors.append({
-                    "symbol": symbol, 
-                    "error": "Ticker appears delisted or no data available"
-                })
-                print(f"[{datetime.utcnow().isoformat()}] {symbol}: Ticker appears delisted, skipping.")
-            else:
-                errors.append({"symbol": symbol, "error": str(exc)})
+            print(f"[{datetime.utcnow().isoformat()}] Ollama server unavailable during insights refresh for {symbol}. Preserving existing insights.")
+        elif any(keyword in error_str for keyword in DELISTED_ERROR_KEYWORDS):
+            record_error({
+                "symbol": symbol,
+                "error": "Ticker appears delisted or no data available"
+            })
+            print(f"[{datetime.utcnow().isoformat()}] {symbol}: Ticker appears delisted, skipping.")
+        else:
+            record_error({"symbol": symbol, "error": str(exc)})
 
-    return {"user_id": user_id, "refreshed": refreshed, "errors": errors}
 
+async def _refresh_tracked_insights(user_ids: List[str]) -> Dict[str, dict]:
+    """Refresh tracked insights for several users concurrently.
 
-def refresh_tracked_insights_job():
+    Price lookups run up to INSIGHTS_YAHOO_CONCURRENCY at a time while at most
+    INSIGHTS_OLLAMA_CONCURRENCY pipelines hit Ollama. If Ollama is detected as
+    unavailable, remaining tickers keep their existing insights.
+    """
+    yahoo_sem = asyncio.Semaphore(INSIGHTS_YAHOO_CONCURRENCY)
+    ollama_sem = asyncio.Semaphore(INSIGHTS_OLLAMA_CONCURRENCY)
+    ollama_unavailable = asyncio.Event()
+    results = {user_id: {"user_id": user_id, "refreshed": [], "errors": []} for user_id in user_ids}
+
+    # symbol -> users tracking it; the same lookup held in several accounts
+    # (or by several users) is quoted and analysed once
+    targets: Dict[str, Dict[str, dict]] = {}
+    for user_id in user_ids:
+        for symbol in await asyncio.to_thread(get_insight_symbols, user_id):
+            targets.setdefault(symbol, {})[user_id] = results[user_id]
+
+    quotes = await _fetch_insight_quotes(list(targets))
+    await asyncio.gather(*(
+        _refresh_insight(
+            symbol, list(user_results.items()), yahoo_sem, ollama_sem, ollama_unavailable, quotes.get(symbol)
+        )
+        for symbol, user_results in targets.items()
+    ))
+    return results
+
+
+async def refresh_tracked_insights_job():
     """Scheduler job to refresh insights daily.
     
     Includes fallback logic to preserve existing insights if Ollama is unavailable.
     """
     print(f"[{datetime.utcnow().isoformat()}] Starting scheduled insights refresh...")
     try:
-        users = get_all_users()
+        users = await asyncio.to_thread(get_all_users)
     except Exception as exc:
         print(f"Failed to load users for insights refresh: {exc}")
         return
@@ -308,10 +544,15 @@ def refresh_tracked_insights_job():
     if not users:
         users = [{"user_id": DEFAULT_USER_ID}]
 
-    for user in users:
-        user_id = user.get("user_id") or DEFAULT_USER_ID
+    user_ids = list(dict.fromkeys(user.get("user_id") or DEFAULT_USER_ID for user in users))
+    try:
+        results = await _refresh_tracked_insights(user_ids)
+    except Exception as exc:
+        print(f"Failed to refresh insights: {exc}")
+        return
+
+    for user_id, result in results.items():
         try:
-            result = refresh_tracked_insights_for_user(user_id)
             refreshed = result.get("refreshed", [])
             errors = result.get("errors", [])
             
@@ -339,15 +580,192 @@ def refresh_tracked_insights_job():
         except Exception as exc:
             print(f"Failed to refresh insights for user {user_id}: {exc}")
 
-def fetch_price(ticker: str) -> tuple[Optional[float], Optional[str]]:
-    """Fetch current price and name for ticker using yfinance with fast_info fallback."""
+def _price_cache_max_age() -> timedelta:
+    return PRICE_CACHE_MAX_AGE if is_market_open() else PRICE_CACHE_CLOSED_MAX_AGE
+
+
+def _get_cached_price(ticker: str) -> Optional[tuple[float, Optional[str]]]:
+    with _price_cache_lock:
+        entry = PRICE_CACHE.get(ticker)
+    if entry is None:
+        return None
+    price, name, fetched_at = entry
+    if datetime.now(timezone.utc) - fetched_at > _price_cache_max_age():
+        return None
+    return price, name
+
+
+def invalidate_cached_price(ticker: str):
+    """Forget the cached quote for ticker."""
+    with _price_cache_lock:
+        PRICE_CACHE.pop(ticker, None)
+
+
+def _yf_ticker(ticker: str) -> yf.Ticker:
+    """A fresh yf.Ticker for one fetch, on the shared pooled session.
+
+    Ticker objects memoize their quote, so they are not shared between fetches;
+    the connection pool and cookie/crumb live on YF_SESSION, and yfinance keeps
+    exchange timezones in its own cache.
+    """
+    return yf.Ticker(ticker, session=YF_SESSION)
+
+
+def _store_cached_price(ticker: str, price: float, name: Optional[str]):
+    with _price_cache_lock:
+        PRICE_CACHE[ticker] = (price, name, datetime.now(timezone.utc))
+
+
+def fetch_price(ticker: str, force_history_fallback: bool = False) -> tuple[Optional[float], Optional[str]]:
+    """Return price and name for ticker, served from the price cache when fresh."""
     if not ticker or ticker.strip() == "-":
         return None, None
 
+    cached = _get_cached_price(ticker)
+    if cached is not None:
+        return cached
+
+    price, name = _fetch_price_uncached(ticker, force_history_fallback)
+    if price is not None:
+        _store_cached_price(ticker, price, name)
+    return price, name
+
+
+def fetch_prices_sequential(symbols: List[str]) -> Dict[str, tuple[float, Optional[str]]]:
+    """Fetch prices one symbol at a time and refresh their price cache entries.
+
+    Each symbol is its own Yahoo round trip; use fetch_prices_bulk first and
+    keep this for the symbols the batched download misses.
+    """
+    results: Dict[str, tuple[float, Optional[str]]] = {}
+    for symbol in symbols:
+        price, name = _fetch_price_uncached(symbol)
+        if price is not None:
+            _store_cached_price(symbol, price, name)
+            results[symbol] = (price, name)
+    return results
+
+
+def fetch_prices_bulk(symbols: List[str]) -> Dict[str, tuple[float, Optional[float]]]:
+    """Fetch (last close, previous close) for many symbols in one yf.download call.
+
+    Symbols Yahoo returns no rows for are left out of the result so callers can
+    fall back to the per-ticker lookup.
+    """
+    symbols = list(dict.fromkeys(s for s in symbols if s and s.strip() != "-"))
+    if not symbols:
+        return {}
+
     try:
-        stock = yf.Ticker(ticker)
+        data = yf.download(
+            tickers=" ".join(symbols),
+            period="2d",
+            interval="1d",
+            group_by="ticker",
+            threads=True,
+            progress=False,
+            timeout=YF_TIMEOUT[1],
+        )
+    except Exception as e:
+        print(f"Bulk price download failed for {len(symbols)} symbols: {e}")
+        return {}
+
+    if data is None or data.empty:
+        return {}
+
+    results: Dict[str, tuple[float, Optional[float]]] = {}
+    for symbol in symbols:
+        if isinstance(data.columns, pd.MultiIndex):
+            if (symbol, "Close") not in data.columns:
+                continue
+            closes = data[(symbol, "Close")].dropna()
+        else:
+            # Single-symbol downloads come back with flat columns
+            if "Close" not in data.columns:
+                continue
+            closes = data["Close"].dropna()
+        if closes.empty:
+            continue
+        previous = float(closes.iloc[-2]) if len(closes) >= 2 else None
+        results[symbol] = (float(closes.iloc[-1]), previous)
+    return results
+
+
+def _cached_name(ticker: str) -> Optional[str]:
+    with _price_cache_lock:
+        entry = PRICE_CACHE.get(ticker)
+    return entry[1] if entry else None
+
+
+def refresh_price_cache():
+    """Scheduler job keeping tracked holdings and market indexes in the price cache"""
+    if not is_market_open():
+        return
+    symbols = {holding['lookup'].strip() for holding in get_active_holdings()}
+    symbols.update(index['symbol'] for index in MARKET_INDEXES)
+    refreshed = {}
+    for symbol, (price, _) in fetch_prices_bulk(sorted(symbols)).items():
+        _store_cached_price(symbol, price, _cached_name(symbol))
+        refreshed[symbol] = price
+    refreshed.update(fetch_prices_sequential(sorted(symbols - refreshed.keys())))
+    print(f"[{datetime.now()}] Price cache refreshed for {len(refreshed)}/{len(symbols)} symbols")
+
+
+def _get_daily_close(stock, ticker: str) -> Optional[float]:
+    """Last close from ticker history, downloaded at most once per ticker per day."""
+    today = datetime.now(timezone.utc).date()
+    key = (ticker, today)
+    with _price_cache_lock:
+        if key in DAILY_CLOSE_CACHE:
+            return DAILY_CLOSE_CACHE[key]
+
+    close = None
+    hist = stock.history(period="2d", interval="1d")
+    if not hist.empty and "Close" in hist:
+        closes = hist["Close"].dropna().tolist()
+        if closes:
+            close = float(closes[-1])
+
+    if close is not None:
+        with _price_cache_lock:
+            for stale_key in [k for k in DAILY_CLOSE_CACHE if k[1] != today]:
+                del DAILY_CLOSE_CACHE[stale_key]
+            DAILY_CLOSE_CACHE[key] = close
+    return close
+
+
+def _ticker_name(stock: yf.Ticker, ticker: str, info: Optional[dict] = None) -> Optional[str]:
+    """Display name for ticker from memory, then SQLite, then (once) Ticker.info."""
+    with _price_cache_lock:
+        if ticker in TICKER_NAMES:
+            return TICKER_NAMES[ticker]
+
+    name = get_ticker_name(ticker)
+    if name is None:
+        try:
+            info = info if info is not None else (stock.info or {})
+            name = info.get("longName") or info.get("shortName")
+        except Exception as e:
+            print(f"Error fetching name for {ticker}: {e}")
+            return None
+        if name:
+            upsert_ticker_name(ticker, name)
+
+    # Misses are remembered too so .info is not retried on every price fetch
+    with _price_cache_lock:
+        TICKER_NAMES[ticker] = name
+    return name
+
+
+def _fetch_price_uncached(ticker: str, force_history_fallback: bool = False) -> tuple[Optional[float], Optional[str]]:
+    """Fetch current price via fast_info; .info is only used when fast_info has no price."""
+    if not ticker or ticker.strip() == "-":
+        return None, None
+
+    try:
+        stock = _yf_ticker(ticker)
         price: Optional[float] = None
-        name: Optional[str] = None
+        ticker_info: Optional[dict] = None
 
         fast_info = getattr(stock, "fast_info", {}) or {}
         for key in (
@@ -362,9 +780,6 @@ def fetch_price(ticker: str) -> tuple[Optional[float], Optional[str]]:
                 price = float(value)
                 break
 
-        if not name:
-            name = fast_info.get("longName") or fast_info.get("shortName")
-
         if price is None or price <= 0:
             ticker_info = stock.info or {}
             for key in ("currentPrice", "regularMarketPrice", "previousClose"):
@@ -372,33 +787,38 @@ def fetch_price(ticker: str) -> tuple[Optional[float], Optional[str]]:
                 if value is not None:
                     price = float(value)
                     break
-            if not name:
-                name = ticker_info.get("longName") or ticker_info.get("shortName")
+
+        name = _ticker_name(stock, ticker, ticker_info)
 
         if price is None or price <= 0:
-            hist = stock.history(period="2d", interval="1d")
-            if not hist.empty and "Close" in hist:
-                closes = hist["Close"].dropna().tolist()
-                if closes:
-                    price = float(closes[-1])
-                    if not name:
-                        name = ticker
+            # The history download is the slowest path; only the capture job needs it
+            if not force_history_fallback:
+                return None, name
+            price = _get_daily_close(stock, ticker)
+            if price is not None and not name:
+                name = ticker
 
         return price, name
     except Exception as e:
         print(f"Error fetching price for {ticker}: {e}")
         return None, None
 
+def _build_portfolio_stats(total_value: float, total_contribution: float, holdings_count: int) -> dict:
+    total_gain = total_value - total_contribution
+    total_gain_percent = (total_gain / total_contribution * 100) if total_contribution > 0 else 0
+
+    return {
+        'total_value': total_value,
+        'total_cost': total_contribution,  # Keep for compatibility but use contribution
+        'total_gain': total_gain,
+        'total_gain_percent': total_gain_percent,
+        'holdings_count': holdings_count
+    }
+
 def calculate_portfolio_stats(holdings: List[dict]) -> dict:
     """Calculate portfolio statistics"""
     if not holdings:
-        return {
-            'total_value': 0,
-            'total_cost': 0,
-            'total_gain': 0,
-            'total_gain_percent': 0,
-            'holdings_count': 0
-        }
+        return _build_portfolio_stats(0, 0, 0)
     
     total_value = 0
     total_contribution = 0
@@ -408,69 +828,166 @@ def calculate_portfolio_stats(holdings: List[dict]) -> dict:
         total_value += value
         total_contribution += holding['contribution']
     
-    total_gain = total_value - total_contribution
-    total_gain_percent = (total_gain / total_contribution * 100) if total_contribution > 0 else 0
-    
-    return {
-        'total_value': total_value,
-        'total_cost': total_contribution,  # Keep for compatibility but use contribution
-        'total_gain': total_gain,
-        'total_gain_percent': total_gain_percent,
-        'holdings_count': len(holdings)
-    }
+    return _build_portfolio_stats(total_value, total_contribution, len(holdings))
+
+def get_portfolio_stats(user_id: Optional[str]) -> dict:
+    """Portfolio totals aggregated in SQL, for callers that do not need per-holding rows."""
+    totals = get_portfolio_aggregates(user_id)
+    return _build_portfolio_stats(
+        float(totals['total_value']),
+        float(totals['total_contribution']),
+        totals['holdings_count'],
+    )
 
 def _is_cash_holding(holding: dict) -> bool:
+    # Rows from get_all_holdings carry the flag precomputed in SQL
+    is_cash = holding.get('is_cash')
+    if is_cash is not None:
+        return bool(is_cash)
+    # Same predicate as database._IS_CASH_SQL: whitespace-only symbols count as empty
     category = holding.get('category', '') or ''
-    ticker = holding.get('ticker', '') or ''
-    lookup = holding.get('lookup', '') or ''
+    ticker = (holding.get('ticker', '') or '').strip()
+    lookup = (holding.get('lookup', '') or '').strip()
     return category.strip().lower() == 'cash' or (not ticker and not lookup)
 
 
+def _float_array(holdings: List[dict], key: str) -> np.ndarray:
+    """Column of floats from holding dicts; missing or non-numeric values become NaN."""
+    values = []
+    for holding in holdings:
+        value = holding.get(key)
+        try:
+            values.append(float(value) if value is not None else np.nan)
+        except (TypeError, ValueError):
+            values.append(np.nan)
+    return np.array(values, dtype=np.float64)
+
+
+def _bool_array(holdings: List[dict], key: str) -> np.ndarray:
+    return np.fromiter((bool(holding.get(key)) for holding in holdings), dtype=bool, count=len(holdings))
+
+
 def enrich_holdings_with_calculations(holdings: List[dict]) -> tuple[List[dict], dict]:
-    """Add calculated fields to holdings"""
-    enriched_holdings = []
+    """Add calculated fields to holdings using vectorized column arithmetic"""
+    if not holdings:
+        return [], calculate_portfolio_stats([])
+
+    shares = _float_array(holdings, 'shares')
+    cost_per_share = _float_array(holdings, 'cost')
+    contribution = _float_array(holdings, 'contribution')
+    latest_price = _float_array(holdings, 'latest_price')
+    value_override = _float_array(holdings, 'value_override')
+    manual_override = _bool_array(holdings, 'manual_price_override')
+    if all('is_cash' in holding for holding in holdings):
+        is_cash = _bool_array(holdings, 'is_cash')
+    else:
+        is_cash = np.fromiter((_is_cash_holding(holding) for holding in holdings), dtype=bool, count=len(holdings))
+
+    use_price_history = ~manual_override & ~is_cash & ~np.isnan(latest_price)
+    current_price = np.where(use_price_history, latest_price, _float_array(holdings, 'current_price'))
+    market_value = shares * current_price
+
+    # Calculated fields
+    value = np.where(np.isnan(value_override), market_value, value_override)
+    absolute_gain = value - contribution  # Current value - total contribution
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relative_gain = np.where(contribution > 0, absolute_gain / contribution * 100, 0.0)
 
-    for holding in holdings:
-        shares = holding['shares']
-
-        latest_price = holding.get('latest_price')
-        manual_override = bool(holding.get('manual_price_override'))
-        use_price_history = (not manual_override) and (not _is_cash_holding(holding)) and latest_price is not None
-        current_price = latest_price if use_price_history else holding['current_price']
-        cost_per_share = holding['cost']
-        contribution = holding['contribution']
-        
-        # Calculated fields
-        value_override = holding.get('value_override')
-        value = value_override if value_override is not None else shares * current_price
-        absolute_gain = value - contribution  # Current value - total contribution
-        relative_gain = (absolute_gain / contribution * 100) if contribution > 0 else 0
-        
         # Percent change based on share price
-        percent_change = ((current_price - cost_per_share) / cost_per_share * 100) if cost_per_share > 0 else 0
-        dollar_change = absolute_gain
-        
-        enriched_holding = dict(holding)
-        enriched_holding.update({
-            'current_price': current_price,
-            'value': value,
-            'absolute_gain': absolute_gain,
-            'relative_gain': relative_gain,
-            'percent_change': percent_change,
-            'dollar_change': dollar_change,
-            'price_source': 'price_history' if use_price_history else 'holdings_table'
-        })
-        
-        enriched_holdings.append(enriched_holding)
-    
-    portfolio_stats = calculate_portfolio_stats(enriched_holdings)
+        percent_change = np.where(cost_per_share > 0, (current_price - cost_per_share) / cost_per_share * 100, 0.0)
+
+    portfolio_stats = _build_portfolio_stats(
+        float(np.nansum(market_value)),
+        float(np.nansum(contribution)),
+        len(holdings),
+    )
     total_value = portfolio_stats['total_value']
+    portfolio_percentage = value / total_value * 100 if total_value > 0 else np.zeros(len(holdings))
+
+    # Merge back onto the source dicts so untouched keys keep their original
+    # values (and None stays None for JSON encoding).
+    enriched_holdings = [
+        dict(
+            holding,
+            current_price=price,
+            value=holding_value,
+            absolute_gain=gain,
+            relative_gain=rel_gain,
+            percent_change=pct_change,
+            dollar_change=gain,
+            price_source='price_history' if from_history else 'holdings_table',
+            portfolio_percentage=percentage,
+        )
+        for holding, price, holding_value, gain, rel_gain, pct_change, from_history, percentage in zip(
+            holdings,
+            current_price.tolist(),
+            value.tolist(),
+            absolute_gain.tolist(),
+            relative_gain.tolist(),
+            percent_change.tolist(),
+            use_price_history.tolist(),
+            portfolio_percentage.tolist(),
+        )
+    ]
+    # is_cash is a helper column from SQL, not part of the API row
+    for enriched in enriched_holdings:
+        enriched.pop('is_cash', None)
 
-    # Update portfolio percentage now that totals are based on refreshed prices
-    for holding in enriched_holdings:
-        value = holding['value']
-        holding['portfolio_percentage'] = (value / total_value * 100) if total_value > 0 else 0
-    
+    return enriched_holdings, portfolio_stats
+
+# Enriched holdings per user_id (None = all users), tagged with the in-process
+# portfolio version. Holding mutations and price captures bump the version;
+# the DB fingerprint is rechecked periodically to pick up writes made by other
+# processes (e.g. scripts/capture_prices.py).
+ENRICHED_CACHE_REVALIDATE_SECONDS = 30
+# user_id comes from the query string, so the cache is LRU-bounded
+ENRICHED_CACHE_MAX_ENTRIES = 32
+_holdings_cache: "OrderedDict[Optional[str], tuple[int, tuple, float, List[dict], dict]]" = OrderedDict()
+_holdings_cache_lock = threading.Lock()
+_portfolio_version = 0
+
+
+def bump_portfolio_version():
+    """Invalidate every cached enriched portfolio."""
+    global _portfolio_version
+    with _holdings_cache_lock:
+        _portfolio_version += 1
+        # Every entry is now superseded; drop them rather than wait for a reader
+        _holdings_cache.clear()
+
+
+def _store_enriched_holdings(user_id: Optional[str], entry: tuple):
+    """Insert or refresh a cache entry as most recently used. Caller holds _holdings_cache_lock."""
+    _holdings_cache[user_id] = entry
+    _holdings_cache.move_to_end(user_id)
+    while len(_holdings_cache) > ENRICHED_CACHE_MAX_ENTRIES:
+        _holdings_cache.popitem(last=False)
+
+
+def get_enriched_holdings(user_id: Optional[str]) -> tuple[List[dict], dict]:
+    """Enriched holdings and stats for a user (all users when None), cached until the data changes."""
+    with _holdings_cache_lock:
+        version = _portfolio_version
+        entry = _holdings_cache.get(user_id)
+        if entry is not None:
+            _holdings_cache.move_to_end(user_id)
+
+    now = monotonic()
+    if entry is not None and entry[0] == version:
+        _, db_state, checked_at, enriched_holdings, portfolio_stats = entry
+        if now - checked_at < ENRICHED_CACHE_REVALIDATE_SECONDS:
+            return enriched_holdings, portfolio_stats
+        if get_holdings_cache_state(user_id) == db_state:
+            with _holdings_cache_lock:
+                if _holdings_cache.get(user_id) is entry:
+                    _store_enriched_holdings(user_id, (version, db_state, now, enriched_holdings, portfolio_stats))
+            return enriched_holdings, portfolio_stats
+
+    db_state = get_holdings_cache_state(user_id)
+    enriched_holdings, portfolio_stats = enrich_holdings_with_calculations(get_all_holdings(user_id=user_id))
+    with _holdings_cache_lock:
+        # A bump while we were rebuilding leaves this entry stale for the next reader
+        _store_enriched_holdings(user_id, (version, db_state, now, enriched_holdings, portfolio_stats))
     return enriched_holdings, portfolio_stats
 
 # Web Routes
@@ -498,8 +1015,7 @@ async def api_get_holdings(user_id: Optional[str] = None):
     """Get all holdings with calculations, optionally scoped to a user."""
     if user_id is None:
         user_id = DEFAULT_USER_ID
-    holdings = [dict(row) for row in get_all_holdings_for_user(user_id)]
-    enriched_holdings, portfolio_stats = enrich_holdings_with_calculations(holdings)
+    enriched_holdings, portfolio_stats = get_enriched_holdings(user_id)
     
     return {
         "holdings": enriched_holdings,
@@ -513,20 +1029,24 @@ async def api_get_users():
     users = get_all_users()
     return {"users": users}
 
-@app.post("/api/holdings")
-async def api_create_holding(holding: HoldingCreate):
+@app.post("/api/holdings", openapi_extra=_body_openapi(HOLDING_CREATE_ADAPTER))
+async def api_create_holding(payload: dict = Body(...)):
     """Create new holding"""
+    holding = _validate_payload(HOLDING_CREATE_ADAPTER, payload)
     try:
         holding_id = create_holding(holding.model_dump())
+        bump_portfolio_version()
         return {"id": holding_id, "message": "Holding created successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.put("/api/holdings/{holding_id}")
-async def api_update_holding(holding_id: int, holding: HoldingUpdate):
+@app.put("/api/holdings/{holding_id}", openapi_extra=_body_openapi(HOLDING_UPDATE_ADAPTER))
+async def api_update_holding(holding_id: int, payload: dict = Body(...)):
     """Update existing holding by creating new version"""
+    holding = _validate_payload(HOLDING_UPDATE_ADAPTER, payload)
     try:
         new_holding_id = update_holding(holding_id, holding.model_dump())
+        bump_portfolio_version()
         return {"id": new_holding_id, "message": "Holding updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -536,6 +1056,7 @@ async def api_delete_holding(holding_id: int):
     """Delete holding"""
     try:
         delete_holding(holding_id)
+        bump_portfolio_version()
         return {"message": "Holding deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -551,15 +1072,16 @@ async def api_get_holding_history(holding_id: int):
         
         # Get all versions of this holding
         history = get_holding_history(holding['holding_id'])
-        history_dicts = [dict(row) for row in history]
         
-        return {"history": history_dicts}
+        return {"history": history}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/fetch-price")
 async def api_fetch_price(payload: PriceRequest):
     ticker = payload.ticker
+    # An explicit fetch always goes to Yahoo rather than the price cache
+    invalidate_cached_price(ticker)
     price, name = fetch_price(ticker)
     if price is None:
         raise HTTPException(status_code=404, detail="Price not found")
@@ -567,6 +1089,7 @@ async def api_fetch_price(payload: PriceRequest):
     if price is not None:
         # Store price history
         add_price_history(ticker, price)
+        bump_portfolio_version()
         return {"ticker": ticker, "price": price, "name": name}
     else:
         raise HTTPException(status_code=404, detail=f"Could not fetch price for {ticker}")
@@ -576,8 +1099,7 @@ async def api_get_price_history(ticker: str, days: int = 30):
     """Get price history for a ticker"""
     try:
         history = get_price_history(ticker, days)
-        history_dicts = [dict(row) for row in history]
-        return {"ticker": ticker, "history": history_dicts}
+        return {"ticker": ticker, "history": history}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -611,8 +1133,7 @@ async def api_get_portfolio_history(
 async def api_get_portfolio_by_account_type():
     """Get portfolio data grouped by account type for visualization"""
     try:
-        holdings = get_all_holdings()
-        enriched_holdings, _ = enrich_holdings_with_calculations(holdings)
+        enriched_holdings, _ = get_enriched_holdings(None)
         
         # Group by account_type
         account_data = {}
@@ -636,35 +1157,43 @@ async def api_get_portfolio_by_account_type():
 
 @app.post("/api/capture-prices")
 async def api_capture_prices():
-    capture_portfolio_prices()
+    await capture_portfolio_prices_async()
     return {"message": "Price capture triggered"}
 
-@app.get("/api/market-summary")
-async def api_market_summary():
+async def _build_market_summary() -> List[Dict[str, object]]:
+    symbols = [index['symbol'] for index in MARKET_INDEXES]
+    quotes = await _fetch_prices_bulk_with_timeout(symbols)
+
+    # Indexes the batched download missed are looked up individually, in parallel
+    missing = [symbol for symbol in symbols if symbol not in quotes]
+    results = await asyncio.gather(
+        *(
+            _run_blocking_with_timeout(PRICE_FETCH_TIMEOUT_SECONDS, "Price fetch timeout", fetch_price, symbol)
+            for symbol in missing
+        ),
+        return_exceptions=True,
+    )
+    fallbacks = {
+        symbol: (None, None) if isinstance(result, Exception) else result
+        for symbol, result in zip(missing, results)
+    }
+
     summary = []
     for index in MARKET_INDEXES:
-        price, name = fetch_price(index['symbol'])
-        if price is None:
-            summary.append({
-                "id": index['id'],
-                "name": name or index['name'],
-                "symbol": index['symbol'],
-                "price": None,
-                "change": None,
-                "change_percent": None,
-            })
-            continue
+        quote = quotes.get(index['symbol'])
+        if quote is None:
+            price, name = fallbacks[index['symbol']]
+            previous = None
+        else:
+            price, previous = quote
+            name = _cached_name(index['symbol'])
 
-        ticker = yf.Ticker(index['symbol'])
-        hist = ticker.history(period="2d", interval="1d")
         change = None
         change_percent = None
-        if not hist.empty and len(hist['Close']) >= 2:
-            latest = hist['Close'].iloc[-1]
-            previous = hist['Close'].iloc[-2]
-            change = float(latest - previous)
+        if price is not None and previous is not None:
+            change = price - previous
             if previous != 0:
-                change_percent = float((change / previous) * 100)
+                change_percent = (change / previous) * 100
 
         summary.append({
             "id": index['id'],
@@ -675,25 +1204,43 @@ async def api_market_summary():
             "change_percent": change_percent,
         })
 
-    return {"indexes": summary}
+    return summary
+
 
-MOVEMENT_RANGE_WINDOWS = {
-    '7d': timedelta(days=7),
-    '1m': timedelta(days=30),
-    '3m': timedelta(days=90),
+def _market_summary_max_age() -> int:
+    return MARKET_SUMMARY_REFRESH_SECONDS if is_market_open() else MARKET_SUMMARY_CLOSED_REFRESH_SECONDS
+
+
+async def refresh_market_summary(force: bool = False):
+    """Scheduler job rebuilding the market summary: every minute while the market is open, every 5 otherwise."""
+    fetched_at = _market_summary_cache.get("fetched_at")
+    if not force and fetched_at is not None and monotonic() - fetched_at < _market_summary_max_age() - 1:
+        return
+    indexes = await _build_market_summary()
+    _market_summary_cache.update(indexes=indexes, fetched_at=monotonic())
+
+
+@app.get("/api/market-summary")
+async def api_market_summary():
+    # Normally served straight from the scheduler's snapshot; it is only built
+    # inline on the first request or if the scheduler is not running
+    fetched_at = _market_summary_cache.get("fetched_at")
+    if fetched_at is None or monotonic() - fetched_at > 2 * MARKET_SUMMARY_CLOSED_REFRESH_SECONDS:
+        await refresh_market_summary(force=True)
+    return {"indexes": _market_summary_cache["indexes"]}
+
+_RANGE_DISPATCH = {
+    '7d': lambda now: now - timedelta(days=7),
+    '1m': lambda now: now - timedelta(days=30),
+    '3m': lambda now: now - timedelta(days=90),
+    'ytd': lambda now: datetime(now.year, 1, 1, tzinfo=timezone.utc),
+    'all': lambda now: None,
 }
 
 
 def _resolve_range_start(range_key: str) -> datetime | None:
-    now = datetime.now(timezone.utc)
-    key = range_key.lower()
-    if key in MOVEMENT_RANGE_WINDOWS:
-        return now - MOVEMENT_RANGE_WINDOWS[key]
-    if key == 'ytd':
-        return datetime(now.year, 1, 1, tzinfo=timezone.utc)
-    if key == 'all':
-        return None
-    return now - MOVEMENT_RANGE_WINDOWS['7d']
+    resolve = _RANGE_DISPATCH.get(range_key.lower(), _RANGE_DISPATCH['7d'])
+    return resolve(datetime.now(timezone.utc))
 
 
 @app.get("/api/portfolio-movement")
@@ -702,15 +1249,13 @@ async def api_portfolio_movement(range: str = '7d', user_id: Optional[str] = Non
         user_id = DEFAULT_USER_ID
     range_key = (range or '7d').lower()
     start_time = _resolve_range_start(range_key)
-    snapshots = get_portfolio_snapshots_since(start_time, user_id)
+    prior_snapshot, snapshots = get_movement_snapshots(user_id, start_time)
 
-    if not snapshots:
-        latest_snapshot = get_latest_portfolio_snapshot(user_id)
-        if latest_snapshot:
-            snapshots = [latest_snapshot]
+    if not snapshots and prior_snapshot:
+        # Nothing inside the range: fall back to the latest snapshot overall
+        snapshots, prior_snapshot = [prior_snapshot], None
 
-    holdings_rows = [dict(row) for row in get_all_holdings_for_user(user_id)]
-    _, current_stats = enrich_holdings_with_calculations(holdings_rows)
+    current_stats = get_portfolio_stats(user_id)
     current_value = float(current_stats.get('total_value', 0))
     now_utc = datetime.utcnow().replace(tzinfo=timezone.utc, microsecond=0)
     current_point = {
@@ -722,16 +1267,10 @@ async def api_portfolio_movement(range: str = '7d', user_id: Optional[str] = Non
     if not snapshots_for_points:
         snapshots_for_points.append(current_point)
 
-    baseline_snapshot = snapshots_for_points[0]
-    if start_time:
-        first_snapshot_time = datetime.fromisoformat(baseline_snapshot['captured_at'])
-        if first_snapshot_time.tzinfo is None:
-            first_snapshot_time = first_snapshot_time.replace(tzinfo=timezone.utc)
-        if first_snapshot_time > start_time:
-            prior_snapshot = get_portfolio_snapshot_before(start_time, user_id)
-            if prior_snapshot:
-                baseline_snapshot = prior_snapshot
-                snapshots_for_points.insert(0, prior_snapshot)
+    # Anchor the series on the last snapshot before the range, unless a
+    # snapshot already sits exactly on the range start
+    if prior_snapshot and snapshots_for_points[0]['captured_at'] != start_time.isoformat():
+        snapshots_for_points.insert(0, prior_snapshot)
 
     latest_snapshot = snapshots_for_points[-1]
     snapshot_last_updated_at = latest_snapshot['captured_at'] if snapshots else current_point['captured_at']
@@ -749,10 +1288,9 @@ async def api_portfolio_movement(range: str = '7d', user_id: Optional[str] = Non
         "previous_value": previous_value,
         "change": change,
         "change_percent": change_percent,
-        "points": [
-            {"timestamp": snap['captured_at'], "value": float(snap['total_value'])}
-            for snap in snapshots_for_points
-        ],
+        # Parallel arrays instead of one dict per point keep large ranges cheap to serialize
+        "points_ts": [snap['captured_at'] for snap in snapshots_for_points],
+        "points_val": [float(snap['total_value']) for snap in snapshots_for_points],
         "last_updated_at": snapshot_last_updated_at,
         "user_id": user_id,
         "range": range_key,
@@ -808,25 +1346,7 @@ async def api_run_insight(payload: InsightRunRequest):
 @app.post("/api/insights/refresh")
 async def api_refresh_insights(payload: InsightRefreshRequest):
     user_id = payload.user_id or DEFAULT_USER_ID
-    holdings = [dict(row) for row in get_all_holdings_for_user(user_id)]
-    refreshed = []
-    errors: list[dict[str, str]] = []
-
-    for holding in holdings:
-        if not holding.get("track_insights"):
-            continue
-        symbol = (holding.get("lookup") or holding.get("ticker") or "").strip()
-        if not symbol:
-            continue
-        try:
-            quote = get_stock_price_info(symbol)
-            result = run_insights_pipeline(symbol, quote.current_price, quote.previous_close or quote.current_price)
-            _save_insight(user_id, symbol, result["summary"], result["analysis"])
-            refreshed.append(symbol.upper())
-        except Exception as exc:
-            errors.append({"symbol": symbol, "error": str(exc)})
-
-    return {"user_id": user_id, "refreshed": refreshed, "errors": errors}
+    return (await _refresh_tracked_insights([user_id]))[user_id]
 
 
 @app.get("/api/insights")
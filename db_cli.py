@@ -6,12 +6,11 @@ A simple command-line interface to interact with the portfolio database.
 
 import sqlite3
 import argparse
+import csv
 import sys
 import os
 from datetime import datetime, timedelta
-from tabulate import tabulate
-import pandas as pd
-import yfinance as yf
+from itertools import repeat
 from dotenv import load_dotenv
 
 # Add backend to path and import database module explicitly
@@ -21,17 +20,67 @@ sys.path.append(BACKEND_DIR)
 
 load_dotenv(os.path.join(CURRENT_DIR, ".env"))
 
-from backend.database import add_price_history, get_price_history, get_active_holdings, DATABASE
+from backend.database import add_price_history, add_price_history_rows, get_price_history, get_active_holdings, DATABASE
 
 def get_connection():
-    """Get database connection"""
+    """Get the database connection shared by the subcommand for this process"""
     print(f"Using database: {DATABASE}")
-    return sqlite3.connect(DATABASE)
+    conn = sqlite3.connect(DATABASE)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    # Same page cache and mmap window as the backend's connections
+    conn.execute('PRAGMA cache_size=-65536')
+    conn.execute('PRAGMA mmap_size=268435456')
+    return conn
 
-def show_price_history(args):
+def _format_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        return format(value, 'g')
+    return str(value)
+
+def _print_grid(rows, headers):
+    """Render rows in tabulate's grid layout in a single pass; numbers are right-aligned"""
+    cells = [[_format_cell(value) for value in row] for row in rows]
+    numeric = [
+        all(isinstance(row[i], (int, float)) for row in rows if row[i] is not None)
+        and any(row[i] is not None for row in rows)
+        for i in range(len(headers))
+    ]
+    widths = [max([len(header)] + [len(row[i]) for row in cells]) for i, header in enumerate(headers)]
+
+    def rule(char):
+        return '+' + '+'.join(char * (width + 2) for width in widths) + '+'
+
+    def line(values):
+        return '| ' + ' | '.join(
+            value.rjust(width) if is_numeric else value.ljust(width)
+            for value, width, is_numeric in zip(values, widths, numeric)
+        ) + ' |'
+
+    out = [rule('-'), line(headers), rule('=')]
+    for row in cells:
+        out.append(line(row))
+        out.append(rule('-'))
+    print('\n'.join(out))
+
+def print_table(rows, headers, fancy=False):
+    """Print rows as a grid; --fancy switches to tabulate's full formatter"""
+    if fancy:
+        from tabulate import tabulate
+        print(tabulate(rows, headers=headers, tablefmt='grid'))
+    else:
+        _print_grid(rows, headers)
+
+def print_rows(cursor, fancy=False):
+    """Print a fetched result set headed by its column names"""
+    rows = cursor.fetchall()
+    print_table(rows, [column[0] for column in cursor.description], fancy)
+
+def show_price_history(args, conn):
     """Show price history for a ticker"""
-    conn = get_connection()
-    
     if args.ticker:
         query = '''
             SELECT ticker, price, date, created_at 
@@ -39,22 +88,22 @@ def show_price_history(args):
             WHERE ticker = ? 
             ORDER BY date DESC
         '''
-        df = pd.read_sql_query(query, conn, params=[args.ticker])
+        params = [args.ticker]
     else:
         query = '''
             SELECT ticker, price, date, created_at 
             FROM price_history 
             ORDER BY date DESC, ticker
         '''
-        df = pd.read_sql_query(query, conn)
+        params = []
     
     if args.limit:
-        df = df.head(args.limit)
+        query += ' LIMIT ?'
+        params.append(args.limit)
     
-    print(tabulate(df, headers='keys', tablefmt='grid', showindex=False))
-    conn.close()
+    print_rows(conn.execute(query, params), args.fancy)
 
-def add_price(args):
+def add_price(args, conn):
     """Add price history entry"""
     try:
         price = float(args.price)
@@ -68,10 +117,8 @@ def add_price(args):
     except Exception as e:
         print(f"❌ Error: {e}")
 
-def show_holdings(args):
+def show_holdings(args, conn):
     """Show holdings summary"""
-    conn = get_connection()
-    
     query = '''
         SELECT 
             account_type,
@@ -83,59 +130,75 @@ def show_holdings(args):
             contribution,
             is_deleted
         FROM holdings 
-        ORDER BY account_type, account, ticker
     '''
-    
-    df = pd.read_sql_query(query, conn)
-    
     if args.active_only:
-        df = df[df['is_deleted'] == False]
+        query += ' WHERE is_deleted = FALSE'
+    query += ' ORDER BY account_type, account, ticker'
     
-    print(tabulate(df, headers='keys', tablefmt='grid', showindex=False))
-    conn.close()
+    print_rows(conn.execute(query), args.fancy)
+
+# Above this many active holdings the per-account-type totals are summed in
+# NumPy instead of by SQLite's row-at-a-time aggregation
+STATS_NUMPY_MIN_ROWS = 10_000
+
+STATS_ACTIVE_FILTER = "is_deleted = FALSE AND ticker != ''"
+STATS_BY_TYPE_SQL = f'''
+    SELECT 'by_type' AS kind, account_type AS label, COUNT(*) AS count,
+           SUM(shares * current_price) AS first_value,
+           SUM(contribution) AS second_value,
+           SUM(shares * current_price) AS sort_key
+    FROM holdings
+    WHERE {STATS_ACTIVE_FILTER}
+    GROUP BY account_type
+'''
+STATS_COVERAGE_SQL = '''
+    SELECT 'coverage' AS kind, ticker AS label, COUNT(*) AS count,
+           MIN(date) AS first_value, MAX(date) AS second_value, COUNT(*) AS sort_key
+    FROM price_history
+    GROUP BY ticker
+'''
 
-def show_portfolio_stats(args):
+def _account_type_totals_numpy(conn):
+    """Per-account-type rows shaped like STATS_BY_TYPE_SQL, summed with np.bincount"""
+    import numpy as np
+
+    rows = conn.execute(
+        f'SELECT account_type, shares, current_price, contribution FROM holdings WHERE {STATS_ACTIVE_FILTER}'
+    ).fetchall()
+    account_types, shares, prices, contributions = zip(*rows)
+    labels, groups = np.unique(np.array(account_types, dtype=object), return_inverse=True)
+    values = np.bincount(groups, weights=np.asarray(shares, dtype=float) * np.asarray(prices, dtype=float),
+                         minlength=len(labels))
+    contributed = np.bincount(groups, weights=np.asarray(contributions, dtype=float), minlength=len(labels))
+    counts = np.bincount(groups, minlength=len(labels))
+    return [
+        ('by_type', labels[i], int(counts[i]), float(values[i]), float(contributed[i]), float(values[i]))
+        for i in np.argsort(-values, kind='stable')
+    ]
+
+def show_portfolio_stats(args, conn):
     """Show portfolio statistics"""
-    conn = get_connection()
+    active_count = conn.execute(f'SELECT COUNT(*) FROM holdings WHERE {STATS_ACTIVE_FILTER}').fetchone()[0]
+    if active_count >= STATS_NUMPY_MIN_ROWS:
+        rows = _account_type_totals_numpy(conn)
+        rows += conn.execute(STATS_COVERAGE_SQL + ' ORDER BY sort_key DESC').fetchall()
+    else:
+        # Both summaries come back from one query; `kind` tells the result sets apart
+        query = f'{STATS_BY_TYPE_SQL} UNION ALL {STATS_COVERAGE_SQL} ORDER BY kind, sort_key DESC'
+        rows = conn.execute(query).fetchall()
     
     # Holdings by account type
-    query = '''
-        SELECT 
-            account_type,
-            COUNT(*) as count,
-            SUM(shares * current_price) as total_value,
-            SUM(contribution) as total_contribution
-        FROM holdings 
-        WHERE is_deleted = FALSE AND ticker != ''
-        GROUP BY account_type
-        ORDER BY total_value DESC
-    '''
-    
-    df = pd.read_sql_query(query, conn)
+    by_type = [row[1:5] for row in rows if row[0] == 'by_type']
     print("=== Portfolio by Account Type ===")
-    print(tabulate(df, headers='keys', tablefmt='grid', showindex=False))
+    print_table(by_type, ['account_type', 'count', 'total_value', 'total_contribution'], args.fancy)
     
     # Price history coverage
-    query = '''
-        SELECT 
-            ticker,
-            COUNT(*) as price_points,
-            MIN(date) as first_date,
-            MAX(date) as last_date
-        FROM price_history
-        GROUP BY ticker
-        ORDER BY price_points DESC
-    '''
-    
-    df = pd.read_sql_query(query, conn)
+    coverage = [row[1:5] for row in rows if row[0] == 'coverage']
     print("\n=== Price History Coverage ===")
-    print(tabulate(df, headers='keys', tablefmt='grid', showindex=False))
-    
-    conn.close()
+    print_table(coverage, ['ticker', 'price_points', 'first_date', 'last_date'], args.fancy)
 
-def delete_price(args):
+def delete_price(args, conn):
     """Delete price history entries"""
-    conn = get_connection()
     cursor = conn.cursor()
     
     if args.ticker and args.date:
@@ -149,36 +212,57 @@ def delete_price(args):
         return
     
     conn.commit()
-    conn.close()
 
-def bulk_import(args):
+# Statement text lives at module level so sqlite3's statement cache reuses it
+IMPORT_UPSERT_SQL = '''
+    INSERT OR REPLACE INTO price_history (ticker, price, date)
+    VALUES (?, ?, ?)
+'''
+
+def bulk_import(args, conn):
     """Bulk import price data from CSV"""
     try:
-        df = pd.read_csv(args.file)
         required_cols = ['ticker', 'price', 'date']
+        with open(args.file, newline='') as f:
+            reader = csv.DictReader(f)
+            if not all(col in (reader.fieldnames or []) for col in required_cols):
+                print(f"❌ CSV must contain columns: {required_cols}")
+                return
+            
+            # The import can simply be rerun, so skip fsyncs for this session
+            conn.execute('PRAGMA synchronous=OFF')
+            # Rows stream from the file straight into executemany; nothing is
+            # held in memory beyond the current line
+            conn.execute('BEGIN')
+            cursor = conn.executemany(
+                IMPORT_UPSERT_SQL,
+                ((row['ticker'], float(row['price']), row['date']) for row in reader),
+            )
+            conn.commit()
         
-        if not all(col in df.columns for col in required_cols):
-            print(f"❌ CSV must contain columns: {required_cols}")
-            return
-        
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        for _, row in df.iterrows():
-            cursor.execute('''
-                INSERT OR REPLACE INTO price_history (ticker, price, date)
-                VALUES (?, ?, ?)
-            ''', (row['ticker'], row['price'], row['date']))
-        
-        conn.commit()
-        conn.close()
-        
-        print(f"✅ Imported {len(df)} price records")
+        print(f"✅ Imported {cursor.rowcount} price records")
         
     except Exception as e:
         print(f"❌ Error importing: {e}")
 
-def backfill_prices(args):
+def _download_frame(data, symbol):
+    """Columns for one symbol from a yf.download result (flat for a single ticker)"""
+    import pandas as pd
+
+    if data.empty:
+        return data
+    if isinstance(data.columns, pd.MultiIndex):
+        if symbol not in data.columns.get_level_values(0):
+            return pd.DataFrame()
+        return data[symbol].dropna(how='all')
+    return data
+
+def backfill_prices(args, conn):
+    # Heavy third-party imports are deferred to the handlers that use them, so
+    # cheap commands like delete and add-price start quickly
+    import pandas as pd
+    import yfinance as yf
+
     start_date = datetime.strptime(args.start_date, '%Y-%m-%d')
     end_date = datetime.strptime(args.end_date, '%Y-%m-%d') if args.end_date else datetime.utcnow()
     end_date_inclusive = end_date + timedelta(days=1)
@@ -186,37 +270,47 @@ def backfill_prices(args):
     holdings = get_active_holdings()
     tickers = args.tickers.split(',') if args.tickers else sorted({(h.get('lookup') or '').strip().upper() for h in holdings if (h.get('lookup') or '').strip()})
 
-    if not tickers:
+    symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in tickers if symbol.strip()))
+
+    if not symbols:
         print('⚠️  No tickers found to backfill. Ensure holdings have lookup symbols and track_price enabled.')
         return
 
-    for symbol in tickers:
-        symbol = symbol.strip().upper()
-        if not symbol:
-            continue
+    # One batched request for every ticker; per-ticker history is only the fallback
+    try:
+        data = yf.download(' '.join(symbols), start=start_date, end=end_date_inclusive, interval='1d',
+                           group_by='ticker', threads=True, progress=False)
+    except Exception as e:
+        print(f"⚠️  Batched download failed, falling back to per-ticker history: {e}")
+        data = pd.DataFrame()
+
+    for symbol in symbols:
         print(f"→ Backfilling {symbol} from {start_date.date()} to {end_date.date()}...")
         try:
-            hist = yf.download(symbol, start=start_date, end=end_date_inclusive, interval='1d', progress=False, threads=False)
+            hist = _download_frame(data, symbol)
             if hist.empty:
                 ticker = yf.Ticker(symbol)
                 hist = ticker.history(start=start_date, end=end_date_inclusive, interval='1d')
             if hist.empty:
                 print(f"   ⚠️  No historical data for {symbol}")
                 continue
-            rows_added = 0
-            for index, row in hist.iterrows():
-                price = row.get('Close') or row.get('Adj Close')
-                if price is None or pd.isna(price):
-                    continue
-                entry_dt = index.to_pydatetime()
-                add_price_history(symbol, float(price), date_override=entry_dt.strftime('%Y-%m-%d'), captured_at=entry_dt)
-                rows_added += 1
-            print(f"   ✅ Added {rows_added} prices for {symbol}")
+            # Close, falling back to Adj Close, selected column-wise rather than per row
+            closes = hist['Close'] if 'Close' in hist else hist['Adj Close']
+            if 'Adj Close' in hist:
+                closes = closes.fillna(hist['Adj Close'])
+            closes = closes.dropna().astype(float)
+            dates = closes.index.strftime('%Y-%m-%d').tolist()
+            stamps = [ts.isoformat() for ts in closes.index]
+            # One transaction per ticker instead of one per day
+            rows = list(zip(repeat(symbol), closes.tolist(), dates, stamps))
+            add_price_history_rows(rows)
+            print(f"   ✅ Added {len(rows)} prices for {symbol}")
         except Exception as e:
             print(f"   ❌ Error backfilling {symbol}: {e}")
 
 def main():
     parser = argparse.ArgumentParser(description='Portfolio Database CLI Tool')
+    parser.add_argument('--fancy', action='store_true', help='Render tables with tabulate (slower on large tables)')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Price history commands
@@ -264,7 +358,12 @@ def main():
         parser.print_help()
         return
     
-    args.func(args)
+    # One connection serves the whole run; handlers never open their own
+    conn = get_connection()
+    try:
+        args.func(args, conn)
+    finally:
+        conn.close()
 
 if __name__ == '__main__':
     main()
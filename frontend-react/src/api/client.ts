@@ -119,6 +119,36 @@ export interface PortfolioMovementSnapshot {
   points?: PortfolioMovementPoint[];
 }
 
+type PortfolioMovementResponse = Omit<PortfolioMovementSnapshot, 'points'> & {
+  points_ts: string[];
+  points_val: number[];
+};
+
+const toMovementSnapshot = ({ points_ts, points_val, ...rest }: PortfolioMovementResponse): PortfolioMovementSnapshot => ({
+  ...rest,
+  points: points_ts.map((timestamp, index) => ({ timestamp, value: points_val[index] })),
+});
+
+interface PortfolioHistorySeries {
+  timestamps: string[];
+  values: number[];
+}
+
+interface PortfolioHistoryResponse {
+  history: PortfolioHistorySeries;
+  account_type_history: Record<string, PortfolioHistorySeries>;
+}
+
+const toHistoryPoints = ({ timestamps, values }: PortfolioHistorySeries): PortfolioHistoryPoint[] =>
+  timestamps.map((date, index) => ({ date, value: values[index] }));
+
+const toPortfolioHistory = ({ history, account_type_history }: PortfolioHistoryResponse) => ({
+  history: toHistoryPoints(history),
+  account_type_history: Object.fromEntries(
+    Object.entries(account_type_history).map(([accountType, series]) => [accountType, toHistoryPoints(series)]),
+  ),
+});
+
 export interface PortfolioStatsResponse {
   total_value: number;
   total_cost: number;
@@ -152,21 +182,22 @@ export const holdingsAPI = {
     api.get<{ ticker: string; history: PriceHistory[] }>(`/api/price-history/${ticker}?days=${days}`),
   capturePrices: () => api.post('/api/capture-prices'),
   getPortfolioHistory: (days: number = 30, userId?: string) =>
-    api.get<{ history: PortfolioHistoryPoint[]; account_type_history: Record<string, PortfolioHistoryPoint[]> }>(
-      '/api/portfolio-history',
-      {
+    api
+      .get<PortfolioHistoryResponse>('/api/portfolio-history', {
         params: {
           days,
           ...(userId ? { user_id: userId } : undefined),
         },
-      },
-    ),
+      })
+      .then((response) => ({ ...response, data: toPortfolioHistory(response.data) })),
   getPortfolioByAccountType: () => api.get<{ account_types: AccountTypeStat[] }>('/api/portfolio-by-account-type'),
   getMarketSummary: () => api.get<{ indexes: MarketIndexSummary[] }>('/api/market-summary'),
   getPortfolioMovement: (range?: MovementRangeOption, userId?: string) =>
-    api.get<PortfolioMovementSnapshot>('/api/portfolio-movement', {
-      params: { ...(range ? { range } : undefined), ...(userId ? { user_id: userId } : undefined) },
-    }),
+    api
+      .get<PortfolioMovementResponse>('/api/portfolio-movement', {
+        params: { ...(range ? { range } : undefined), ...(userId ? { user_id: userId } : undefined) },
+      })
+      .then((response) => ({ ...response, data: toMovementSnapshot(response.data) })),
 };
 
 export const insightsAPI = {
@@ -479,8 +479,10 @@ document.addEventListener('alpine:init', () => {
                 const response = await fetch('http://localhost:8081/api/portfolio-history?days=30');
                 const data = await response.json();
                 
-                if (data.history && data.history.length > 0) {
-                    this.drawPortfolioSparkline(data.history);
+                const series = data.history || { timestamps: [], values: [] };
+                if (series.timestamps.length > 0) {
+                    const history = series.timestamps.map((date, i) => ({ date, value: series.values[i] }));
+                    this.drawPortfolioSparkline(history);
                 }
             } catch (error) {
                 console.error('Error loading portfolio sparkline:', error);